@@ -26,8 +26,10 @@ from config.database import (
     get_ai_analysis_stats, reset_ai_analysis_stats, get_detailed_ai_analysis_stats
 )
 from utils.ai_resume_analyzer import AIResumeAnalyzer
+from utils.analysis_sections import split_sections
 from utils.resume_builder import ResumeBuilder
 from utils.resume_analyzer import ResumeAnalyzer
+from utils.extraction import extract_document
 import traceback
 import plotly.express as px
 import pandas as pd
@@ -824,15 +826,18 @@ class ModernResumeApp:
             try:
                 # Extract text
                 progress_bar.progress(25)
-                if uploaded_file.type == "application/pdf":
-                    text = self.analyzer.extract_text_from_pdf(uploaded_file)
-                else:
-                    text = self.analyzer.extract_text_from_docx(uploaded_file)
+                document = extract_document(uploaded_file)
+                if document.error:
+                    st.error(f"❌ {document.error}")
+                    return
+                text = document.text
                 
                 progress_bar.progress(50)
                 
                 # Analyze
-                analysis = self.analyzer.analyze_resume({'raw_text': text}, role_info)
+                analysis = self.analyzer.analyze_resume(
+                    {'raw_text': text, 'document': document.document}, role_info
+                )
                 progress_bar.progress(100)
                 
                 if 'error' not in analysis:
@@ -853,22 +858,22 @@ class ModernResumeApp:
             try:
                 # Extract text
                 progress_bar.progress(20)
-                if uploaded_file.type == "application/pdf":
-                    text = self.ai_analyzer.extract_text_from_pdf(uploaded_file)
-                else:
-                    text = self.ai_analyzer.extract_text_from_docx(uploaded_file)
+                document = self.ai_analyzer.extract_document(uploaded_file)
+                if document.error:
+                    st.error(f"❌ {document.error}")
+                    return
+                text = document.text
                 
                 progress_bar.progress(40)
                 
-                # AI Analysis
-                if use_custom_job and custom_job_desc:
-                    analysis = self.ai_analyzer.analyze_resume_with_gemini(
-                        text, job_role=selected_role, job_description=custom_job_desc
-                    )
-                else:
-                    analysis = self.ai_analyzer.analyze_resume_with_gemini(
-                        text, job_role=selected_role
-                    )
+                # AI Analysis, rendered section by section as Gemini streams it
+                events = self.ai_analyzer.analyze_resume_with_gemini_stream(
+                    text,
+                    job_role=selected_role,
+                    job_description=custom_job_desc if use_custom_job and custom_job_desc else None
+                )
+                progress_bar.progress(60)
+                analysis = self.display_ai_results(events, selected_role, use_custom_job)
                 
                 progress_bar.progress(80)
                 
@@ -885,7 +890,6 @@ class ModernResumeApp:
                 if analysis and "error" not in analysis:
                     st.success("✅ AI Analysis Complete!")
                     st.snow()
-                    self.display_ai_results(analysis, selected_role, use_custom_job)
                 else:
                     st.error(f"❌ AI Analysis failed: {analysis.get('error', 'Unknown error')}")
                     
@@ -943,21 +947,50 @@ class ModernResumeApp:
             
             st.markdown("</div>", unsafe_allow_html=True)
 
+        # Roles the resume fits best
+        recommended_roles = analysis.get('recommended_roles', [])
+        if recommended_roles:
+            st.markdown("""
+            <div class="analysis-section">
+                <div class="section-header">
+                    <div class="section-icon">🧭</div>
+                    <h3 class="section-title">Best Matching Roles</h3>
+                </div>
+            """, unsafe_allow_html=True)
+            
+            for match in recommended_roles:
+                st.markdown(f"• **{match['role']}** ({match['category']}): {match['score']:.0f}% fit")
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+
     def display_ai_results(self, analysis, role, used_custom_job):
-        """Display AI analysis results"""
-        # Score gauges
+        """Display AI analysis results
+
+        `analysis` is either a finished result or the event stream of
+        analyze_resume_with_gemini_stream, which is rendered section by
+        section as it arrives. Returns the finished result, or a dict with
+        an "error" key if the analysis failed.
+        """
+        events = analysis if not isinstance(analysis, dict) else [
+            {"event": "section", "title": title, "markdown": markdown}
+            for title, markdown in split_sections(analysis.get('analysis', ''))
+        ] + [{"event": "done", "result": analysis}]
+        
+        # Score gauges, filled in as soon as their sections arrive
         col1, col2 = st.columns(2)
+        gauges = {
+            'resume_score': ("Resume Score", col1.empty()),
+            'ats_score': ("ATS Score", col2.empty())
+        }
+        shown_scores = {}
         
-        with col1:
-            self.render_gauge_chart("Resume Score", analysis.get('resume_score', 0))
-        
-        with col2:
-            self.render_gauge_chart("ATS Score", analysis.get('ats_score', 0))
-        
-        # Custom job match score if applicable
-        if used_custom_job and analysis.get('job_match_score'):
-            st.markdown("### 🎯 Job Match Analysis")
-            self.render_gauge_chart("Job Match Score", analysis.get('job_match_score', 0))
+        def show_score(name, value):
+            # Re-render only when the score changed, so the same chart is never drawn twice
+            if shown_scores.get(name) != value:
+                title, slot = gauges[name]
+                with slot.container():
+                    self.render_gauge_chart(title, value)
+                shown_scores[name] = value
         
         # Full AI analysis
         st.markdown("""
@@ -968,19 +1001,36 @@ class ModernResumeApp:
             </div>
         """, unsafe_allow_html=True)
         
-        # Format and display the AI response
-        full_analysis = analysis.get('analysis', '')
-        if full_analysis:
-            # Apply formatting to the analysis
-            formatted_analysis = self.format_ai_analysis(full_analysis)
-            st.markdown(formatted_analysis, unsafe_allow_html=True)
+        # Format and display each section of the AI response as it completes
+        result = {"error": "Unknown error"}
+        for event in events:
+            if event["event"] == "section":
+                st.markdown(self.format_ai_analysis(event["markdown"]), unsafe_allow_html=True)
+            elif event["event"] == "score":
+                show_score(event["name"], event["value"])
+            elif event["event"] == "done":
+                result = event["result"]
+            elif event["event"] == "error":
+                result = {"error": event["error"]}
         
         st.markdown("</div>", unsafe_allow_html=True)
         
+        if "error" in result:
+            return result
+        
+        # Scores from the complete analysis
+        show_score('resume_score', result.get('resume_score', 0))
+        show_score('ats_score', result.get('ats_score', 0))
+        
+        # Custom job match score if applicable
+        if used_custom_job and result.get('job_match_score'):
+            st.markdown("### 🎯 Job Match Analysis")
+            self.render_gauge_chart("Job Match Score", result.get('job_match_score', 0))
+        
         # Download PDF report
         if st.button("📊 Download PDF Report", use_container_width=True):
             pdf_buffer = self.ai_analyzer.generate_pdf_report(
-                analysis_result=analysis,
+                analysis_result=result,
                 candidate_name="User",
                 job_role=role
             )
@@ -992,6 +1042,8 @@ class ModernResumeApp:
                     file_name=f"ai_resume_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
                     mime="application/pdf"
                 )
+        
+        return result
 
     def render_score_card(self, title, score, icon):
         """Render a score card component"""
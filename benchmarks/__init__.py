@@ -0,0 +1,3 @@
+"""
+Extraction benchmarks for Resum.AI
+"""
@@ -0,0 +1,149 @@
+import io
+import os
+import random
+
+# Page counts and layouts covered by the synthetic corpus
+PAGE_COUNTS = [1, 2, 5, 10, 25, 50]
+LAYOUTS = ['single', 'multi']
+
+SECTIONS = ['SUMMARY', 'EXPERIENCE', 'EDUCATION', 'PROJECTS', 'SKILLS', 'CERTIFICATIONS']
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'React', 'SQL', 'Docker', 'Kubernetes', 'AWS', 'Git',
+    'Machine Learning', 'TensorFlow', 'Pandas', 'Agile', 'Scrum', 'REST APIs', 'Node.js'
+]
+VERBS = ['Developed', 'Managed', 'Created', 'Implemented', 'Designed', 'Led', 'Improved']
+NOUNS = ['data pipelines', 'web services', 'dashboards', 'CI/CD workflows', 'ML models', 'test suites']
+
+
+def _resume_lines(rng, pages):
+    """Deterministic resume-like content, roughly 45 lines per page"""
+    lines = ['JANE DOE', 'jane.doe@example.com | 555-123-4567 | linkedin.com/in/janedoe', '']
+    while len(lines) < pages * 45:
+        section = rng.choice(SECTIONS)
+        lines.append(section)
+        for _ in range(rng.randint(4, 8)):
+            if section == 'SKILLS':
+                lines.append(', '.join(rng.sample(SKILLS, 6)))
+            else:
+                year = rng.randint(2005, 2024)
+                lines.append(
+                    f"• {rng.choice(VERBS)} {rng.choice(NOUNS)} using {rng.choice(SKILLS)} "
+                    f"({year}-{year + rng.randint(1, 3)})"
+                )
+        lines.append('')
+    return lines[:pages * 45]
+
+
+def _pdf_text(lines, pages, layout):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    width, height = letter
+    columns = [40] if layout == 'single' else [40, width / 2 + 10]
+    per_column = 45 // len(columns) + 1
+    line_iter = iter(lines)
+    for _ in range(pages):
+        for x in columns:
+            y = height - 50
+            for _ in range(per_column):
+                line = next(line_iter, None)
+                if line is None:
+                    break
+                is_header = line.isupper() and len(line) < 30
+                c.setFont('Helvetica-Bold' if is_header else 'Helvetica', 13 if is_header else 9)
+                c.drawString(x, y, line[:60] if layout == 'multi' else line)
+                y -= 15
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def _pdf_image(lines, pages, layout):
+    """Image-only PDF: each page is a rendered bitmap without a text layer"""
+    from PIL import Image, ImageDraw
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    width, height = letter
+    columns = [30] if layout == 'single' else [30, 650]
+    per_column = 45 // len(columns) + 1
+    line_iter = iter(lines)
+    for _ in range(pages):
+        image = Image.new('L', (1275, 1650), 255)
+        draw = ImageDraw.Draw(image)
+        for x in columns:
+            y = 40
+            for _ in range(per_column):
+                line = next(line_iter, None)
+                if line is None:
+                    break
+                draw.text((x, y), line[:70], fill=0)
+                y += 34
+        c.drawImage(ImageReader(image), 0, 0, width=width, height=height)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def _docx(lines, pages, layout):
+    from docx import Document
+
+    doc = Document()
+    if layout == 'single':
+        for line in lines:
+            doc.add_paragraph(line)
+    else:
+        # Two-column resumes are usually built from a borderless table
+        half = (len(lines) + 1) // 2
+        table = doc.add_table(rows=0, cols=2)
+        for left, right in zip(lines[:half], lines[half:] + ['']):
+            row = table.add_row()
+            row.cells[0].text = left
+            row.cells[1].text = right
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+BUILDERS = {
+    ('pdf', 'text'): _pdf_text,
+    ('pdf', 'image'): _pdf_image,
+    ('docx', 'text'): _docx,
+}
+
+
+def generate_corpus(output_dir, seed=42, page_counts=None):
+    """Write the synthetic corpus below output_dir and return its manifest.
+
+    The same seed always produces the same documents, so timings from
+    different releases are comparable. Each seed gets its own
+    "seed-<seed>" subdirectory, so files generated earlier are only reused
+    for the seed they were generated with.
+    """
+    output_dir = os.path.join(output_dir, f"seed-{seed}")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = []
+    for (kind, content), builder in BUILDERS.items():
+        for layout in LAYOUTS:
+            for pages in page_counts or PAGE_COUNTS:
+                rng = random.Random(f"{seed}:{kind}:{content}:{layout}:{pages}")
+                name = f"resume_{kind}_{content}_{layout}_{pages:02d}p.{kind}"
+                path = os.path.join(output_dir, name)
+                if not os.path.exists(path):
+                    data = builder(_resume_lines(rng, pages), pages, layout)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                manifest.append({
+                    'name': name,
+                    'path': path,
+                    'kind': kind,
+                    'content': content,
+                    'layout': layout,
+                    'pages': pages
+                })
+    return manifest
@@ -0,0 +1,171 @@
+"""
+Benchmark the extraction backends against the synthetic resume corpus.
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --baseline old.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import generate_corpus, PAGE_COUNTS
+
+
+def _pdfplumber(data, pages):
+    from utils.extraction.pipeline import iter_pdf_pages
+    return '\n'.join(page.text for page in iter_pdf_pages(data, []))
+
+
+def _pypdf2(data, pages):
+    from utils.extraction.pipeline import iter_pdf_pages_pypdf2
+    return '\n'.join(page.text for page in iter_pdf_pages_pypdf2(data, []))
+
+
+def _ocr(data, pages):
+    from utils.extraction.ocr import ocr_pages
+    from utils.extraction.source import spill_to_file
+    with spill_to_file(data) as pdf_path:
+        texts = ocr_pages(pdf_path, range(1, pages + 1))
+    return '\n'.join(texts[number] for number in sorted(texts))
+
+
+def _docx_xml(data, pages):
+    from utils.extraction.docx_reader import read_docx_text
+    from utils.extraction.source import BufferReader
+    return read_docx_text(BufferReader(data))[0]
+
+
+def _python_docx(data, pages):
+    from docx import Document
+    from utils.extraction.source import BufferReader
+    return '\n'.join(paragraph.text for paragraph in Document(BufferReader(data)).paragraphs)
+
+
+# Backends applicable to each (kind, content) pair of the corpus
+BACKENDS = {
+    ('pdf', 'text'): {'pdfplumber': _pdfplumber, 'pypdf2': _pypdf2},
+    ('pdf', 'image'): {'pdfplumber': _pdfplumber, 'ocr': _ocr},
+    ('docx', 'text'): {'docx-xml': _docx_xml, 'python-docx': _python_docx},
+}
+
+
+def measure(backend, data, pages, repeats):
+    """Return timing and peak Python heap usage for one backend on one document"""
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        text = backend(data, pages)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is profiled in a separate run so tracing does not skew timings
+    gc.collect()
+    tracemalloc.start()
+    backend(data, pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'max_seconds': max(timings),
+        'peak_python_bytes': peak,
+        'chars': len(text)
+    }
+
+
+def run_benchmarks(corpus_dir, repeats=3, ocr_max_pages=5, backends=None, page_counts=None, seed=42):
+    results = []
+    for doc in generate_corpus(corpus_dir, seed=seed, page_counts=page_counts):
+        with open(doc['path'], 'rb') as f:
+            data = f.read()
+        for name, backend in BACKENDS[(doc['kind'], doc['content'])].items():
+            if backends and name not in backends:
+                continue
+            entry = {'document': doc['name'], 'backend': name, **{k: doc[k] for k in ('kind', 'content', 'layout', 'pages')}}
+            if name == 'ocr' and doc['pages'] > ocr_max_pages:
+                entry['skipped'] = f"more than {ocr_max_pages} pages"
+            else:
+                try:
+                    entry.update(measure(backend, data, doc['pages'], 1 if name == 'ocr' else repeats))
+                except Exception as e:
+                    entry['skipped'] = f"{type(e).__name__}: {e}"
+            print(f"{doc['name']:<42} {name:<12} "
+                  + (f"{entry['median_seconds'] * 1000:9.1f} ms" if 'median_seconds' in entry else entry['skipped']))
+            results.append(entry)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return entries that got slower than the baseline by more than threshold"""
+    previous = {(r['document'], r['backend']): r for r in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry['document'], entry['backend']))
+        if not old or 'median_seconds' not in entry or 'median_seconds' not in old:
+            continue
+        ratio = entry['median_seconds'] / old['median_seconds'] if old['median_seconds'] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append({
+                'document': entry['document'],
+                'backend': entry['backend'],
+                'baseline_seconds': old['median_seconds'],
+                'current_seconds': entry['median_seconds'],
+                'ratio': round(ratio, 3)
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume text extraction backends")
+    parser.add_argument('--output', default='extraction_benchmark.json', help="Path of the JSON report")
+    parser.add_argument('--corpus-dir', default=os.path.join('benchmarks', '.corpus'), help="Where to cache generated documents")
+    parser.add_argument('--seed', type=int, default=42, help="Corpus seed (keep fixed across releases)")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per backend and document")
+    parser.add_argument('--pages', type=int, nargs='*', default=PAGE_COUNTS, help="Page counts to include")
+    parser.add_argument('--backend', action='append', help="Only run the named backend (repeatable)")
+    parser.add_argument('--ocr-max-pages', type=int, default=5, help="Skip OCR on longer documents")
+    parser.add_argument('--baseline', help="Previous report to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    args = parser.parse_args(argv)
+
+    from utils.extraction.cache import EXTRACTOR_VERSION
+
+    results = run_benchmarks(args.corpus_dir, args.repeats, args.ocr_max_pages, args.backend, args.pages, args.seed)
+    report = {
+        'meta': {
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'extractor_version': EXTRACTOR_VERSION,
+            'seed': args.seed,
+            'repeats': args.repeats
+        },
+        'results': results
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(results, json.load(f), args.threshold)
+        for regression in report['regressions']:
+            print(f"REGRESSION {regression['document']} [{regression['backend']}]: "
+                  f"{regression['baseline_seconds'] * 1000:.1f} ms -> {regression['current_seconds'] * 1000:.1f} ms")
+        exit_code = 1 if report['regressions'] else 0
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Report written to {args.output}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
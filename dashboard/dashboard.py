@@ -8,6 +8,8 @@ import io
 import uuid
 from plotly.subplots import make_subplots
 from io import BytesIO
+from utils.timings import get_timing_registry
+from utils.llm_cache import get_response_cache
 
 class DashboardManager:
     def __init__(self):
@@ -473,6 +475,37 @@ class DashboardManager:
                 st.markdown('</div>', unsafe_allow_html=True)
         else:
             st.info("No admin activity logs available")
+        
+        # Render analysis performance section
+        self.render_performance_section()
+
+    def render_performance_section(self):
+        """Render per-stage latency percentiles of the analysis pipelines and AI cache counters"""
+        st.markdown("<h2 class='section-title'>Analysis Performance</h2>", unsafe_allow_html=True)
+        
+        timings = get_timing_registry().snapshot()
+        if timings:
+            df = pd.DataFrame(timings).rename(columns={
+                'stage': 'Stage', 'count': 'Runs',
+                'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'p99_ms': 'p99 (ms)',
+                'mean_ms': 'Mean (ms)', 'max_ms': 'Max (ms)'
+            })
+            st.dataframe(
+                df.style.format({column: '{:.2f}' for column in df.columns[2:]}),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption("Percentiles are bucketed to within 25% and cover this server process since it started.")
+        else:
+            st.info("No analyses have run in this process yet")
+        
+        # Cached Gemini analyses
+        cache_stats = get_response_cache().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("AI Cache Hits", cache_stats['hits'])
+        col2.metric("AI Cache Misses", cache_stats['misses'])
+        col3.metric("AI Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        col4.metric("Cached Analyses", cache_stats['entries'], f"{cache_stats['size_mb']:.1f} MB", delta_color="off")
 
     def export_to_excel(self):
         """Export data to Excel format"""
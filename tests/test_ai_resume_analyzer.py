@@ -0,0 +1,22 @@
+from utils.ai_resume_analyzer import AIResumeAnalyzer
+
+
+def test_resume_score_in_heading_is_preferred_over_numbers_in_the_body():
+    analyzer = AIResumeAnalyzer()
+    analysis = "## Resume Score: 78/100\nThe resume meets 3 of 5 criteria."
+
+    assert analyzer._extract_score_from_text(analysis) == 78
+
+
+def test_resume_score_in_body():
+    analyzer = AIResumeAnalyzer()
+    analysis = "## Overall Assessment\nSolid.\n\n## Resume Score\nThe resume meets 3 of 5 criteria.\nResume Score: 64/100"
+
+    assert analyzer._extract_score_from_text(analysis) == 64
+
+
+def test_ats_score_in_heading():
+    analyzer = AIResumeAnalyzer()
+    analysis = "## ATS Optimization Assessment (ATS Score: 71/100)\nUses 2 of 4 expected keywords."
+
+    assert analyzer._extract_ats_score_from_text(analysis) == 71
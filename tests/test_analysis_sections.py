@@ -0,0 +1,97 @@
+from utils.analysis_sections import SectionIndex, SectionStream, get_section_index, split_sections
+
+ANALYSIS = """Intro line before any heading.
+## Overall Assessment
+Solid backend profile.
+Uses ## inline without starting a section.
+
+## **Strengths**
+- Python
+- SQL
+
+## Resume Score: 78/100
+## Courses
+1. Kubernetes basics
+## Strengths
+Repeated heading.
+"""
+
+EXPECTED_SECTIONS = [
+    ('', 'Intro line before any heading.'),
+    ('Overall Assessment',
+     '## Overall Assessment\nSolid backend profile.\nUses ## inline without starting a section.'),
+    ('**Strengths**', '## **Strengths**\n- Python\n- SQL'),
+    ('Resume Score: 78/100', '## Resume Score: 78/100'),
+    ('Courses', '## Courses\n1. Kubernetes basics'),
+    ('Strengths', '## Strengths\nRepeated heading.'),
+]
+
+
+def stream(chunks):
+    sections = SectionStream()
+    completed = []
+    for chunk in chunks:
+        completed.extend(sections.feed(chunk))
+    return completed + sections.close()
+
+
+def test_split_sections():
+    assert split_sections(ANALYSIS) == EXPECTED_SECTIONS
+    assert split_sections('') == []
+    assert split_sections(None) == []
+
+
+def test_stream_split_at_every_position():
+    # Covers chunks ending inside '## ', right after '\n' and inside the heading text
+    for cut in range(len(ANALYSIS) + 1):
+        assert stream([ANALYSIS[:cut], ANALYSIS[cut:]]) == EXPECTED_SECTIONS, cut
+
+
+def test_stream_split_at_every_pair_of_positions():
+    for first in range(len(ANALYSIS) + 1):
+        for second in range(first, len(ANALYSIS) + 1):
+            chunks = [ANALYSIS[:first], ANALYSIS[first:second], ANALYSIS[second:]]
+            assert stream(chunks) == EXPECTED_SECTIONS, (first, second)
+
+
+def test_stream_one_character_at_a_time():
+    assert stream(ANALYSIS) == EXPECTED_SECTIONS
+
+
+def test_stream_returns_sections_once_complete():
+    sections = SectionStream()
+
+    assert sections.feed('## Overall Assessment\nGood.\n#') == []
+    assert sections.feed('# Stren') == [('Overall Assessment', '## Overall Assessment\nGood.')]
+    assert sections.feed('gths\n- Python') == []
+    assert sections.close() == [('Strengths', '## Strengths\n- Python')]
+
+
+def test_section_index():
+    index = SectionIndex(ANALYSIS)
+
+    assert index.titles == ['Overall Assessment', 'Strengths', 'Resume Score: 78/100', 'Courses']
+    assert index.get('Overall Assessment') == 'Solid backend profile.\nUses ## inline without starting a section.'
+    # Bold markers are stripped from titles and the first of two equal titles wins
+    assert index.get('Strengths') == '- Python\n- SQL'
+    assert index.find('Resume Score') == 'Resume Score: 78/100'
+    assert index.get('Resume Score') == ''
+    assert index.get('Weaknesses') == ''
+    assert index.get('Weaknesses', None) is None
+    assert 'Courses' in index
+    assert 'Weaknesses' not in index
+    assert index.sections() == [
+        ('Overall Assessment', 'Solid backend profile.\nUses ## inline without starting a section.'),
+        ('Strengths', '- Python\n- SQL'),
+        ('Resume Score: 78/100', ''),
+        ('Courses', '1. Kubernetes basics'),
+    ]
+
+
+def test_get_section_index_is_shared_per_text():
+    index = get_section_index({'analysis': ANALYSIS})
+
+    assert get_section_index(ANALYSIS) is index
+    assert get_section_index({'full_response': ANALYSIS}) is index
+    assert get_section_index({}).titles == []
+    assert get_section_index(None).get('Strengths') == ''
@@ -0,0 +1,78 @@
+import io
+import zipfile
+
+from utils.extraction.docx_reader import read_docx_text
+from utils.extraction.pipeline import ExtractionBudget, PageText, _collect_pages, extract_pages
+
+LINES = ['Jane Smith', 'Experience', 'Backend engineer', 'Skills', 'Python, SQL']
+FULL_TEXT = '\n'.join(LINES)
+
+
+def make_docx(lines):
+    """A minimal DOCX with one paragraph per line"""
+    paragraphs = ''.join(f'<w:p><w:r><w:t>{line}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def collect(texts, budget, kind='pdf'):
+    pages = (PageText(number, text, 'test') for number, text in enumerate(texts, 1))
+    warnings = []
+    collected, truncated = _collect_pages(pages, budget, warnings, kind)
+    return [page.text for page in collected], truncated, warnings
+
+
+def test_docx_text_within_the_budget_is_not_truncated():
+    data = make_docx(LINES)
+
+    assert read_docx_text(io.BytesIO(data)) == (FULL_TEXT, False)
+    assert read_docx_text(io.BytesIO(data), len(FULL_TEXT) + 1) == (FULL_TEXT, False)
+    # Ending exactly at the budget leaves nothing behind
+    assert read_docx_text(io.BytesIO(data), len(FULL_TEXT)) == (FULL_TEXT, False)
+
+
+def test_docx_text_past_the_budget_is_truncated():
+    data = make_docx(LINES)
+
+    text, truncated = read_docx_text(io.BytesIO(data), len(FULL_TEXT) - 1)
+    assert (text, truncated) == (FULL_TEXT, True)
+    # Stops at the line that reaches the budget
+    budget = len('Jane Smith\nExperience')
+    assert read_docx_text(io.BytesIO(data), budget) == ('Jane Smith\nExperience', True)
+
+
+def test_docx_budget_warning_counts_characters():
+    data = make_docx(LINES)
+
+    result = extract_pages(data, 'docx', ExtractionBudget(max_chars=12))
+    assert result.truncated
+    assert result.pages[0].text == FULL_TEXT[:12]
+    assert result.warnings == [
+        'Document exceeds the extraction budget (12 characters); only the first 12 characters were processed.'
+    ]
+
+    result = extract_pages(data, 'docx', ExtractionBudget(max_chars=len(FULL_TEXT)))
+    assert not result.truncated
+    assert result.warnings == []
+
+
+def test_pages_ending_exactly_at_the_budget_are_not_truncated():
+    assert collect(['abc', 'de'], ExtractionBudget(max_pages=2, max_chars=5)) == (['abc', 'de'], False, [])
+
+
+def test_pages_past_the_budget_are_truncated():
+    assert collect(['abc', 'de', 'f'], ExtractionBudget(max_pages=2, max_chars=100)) == (
+        ['abc', 'de'],
+        True,
+        ['Document exceeds the extraction budget (2 pages / 100 characters); '
+         'only the first 2 page(s) were processed.'],
+    )
+    # A further page after the character budget is used up, even an empty one, was not processed
+    assert collect(['abc', 'de', ''], ExtractionBudget(max_chars=5))[:2] == (['abc', 'de'], True)
+    assert collect(['abc', 'def'], ExtractionBudget(max_chars=5))[:2] == (['abc', 'def'], True)
@@ -0,0 +1,64 @@
+import random
+import re
+
+from utils.keyword_matcher import KeywordMatcher
+
+KEYWORDS = [
+    'c', 'c++', 'c#', 'java', 'javascript', 'node.js', 'sql', 'mysql', 'work', 'work experience',
+    'experience', 'r', 'go', 'b.e', 'b.tech', 'ml', 'html',
+]
+FILLER = ['and', 'x', '-', ',', ' ', ' ', '.', '/', '(', ')', '\n', 'js', 'tech', 'b', 'e', 'c+', 'ex']
+
+
+def brute_force_positions(text, keywords, word_boundary):
+    """Every offset of every keyword, found with one regex per keyword"""
+    positions = {}
+    for keyword in keywords:
+        if word_boundary:
+            pattern = re.compile(r'(?<!\w)(?=' + re.escape(keyword) + r'(?!\w))')
+        else:
+            pattern = re.compile('(?=' + re.escape(keyword) + ')')
+        offsets = [match.start() for match in pattern.finditer(text)]
+        if offsets:
+            positions[keyword] = offsets
+    return positions
+
+
+def random_texts(count, seed=12):
+    rng = random.Random(seed)
+    pieces = KEYWORDS + FILLER
+    for _ in range(count):
+        yield ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+
+
+def test_matches_a_regex_per_keyword():
+    for word_boundary in (False, True):
+        matcher = KeywordMatcher(KEYWORDS, word_boundary=word_boundary)
+        for text in random_texts(2000):
+            expected = brute_force_positions(text, KEYWORDS, word_boundary)
+            assert matcher.positions(text) == expected, (word_boundary, text)
+            assert matcher.find(text) == set(expected), (word_boundary, text)
+
+
+def test_word_boundaries_around_symbols():
+    matcher = KeywordMatcher(['c', 'c++', 'c#', 'node.js', 'java'], word_boundary=True)
+
+    assert matcher.find('c++, c# and node.js') == {'c', 'c++', 'c#', 'node.js'}
+    assert matcher.find('javascript, objective-c') == {'c'}
+    assert matcher.find('cobol') == set()
+
+
+def test_rescanning_edited_text_reuses_line_hits():
+    matcher = KeywordMatcher(KEYWORDS, word_boundary=True)
+    texts = list(random_texts(300, seed=7))
+    for text, edited in zip(texts, texts[1:]):
+        # The second text shares lines with the first one, which are answered from the line memo
+        edited = '\n'.join(text.split('\n')[:2] + edited.split('\n'))
+        for current in (text, edited):
+            assert matcher.scan(current) == list(matcher.finditer(current))
+            assert matcher.positions(current) == brute_force_positions(current, KEYWORDS, True)
+
+
+def test_empty_inputs():
+    assert KeywordMatcher([]).find('python') == set()
+    assert KeywordMatcher(['python']).positions('') == {}
@@ -0,0 +1,51 @@
+import os
+
+import pdf2image
+
+from utils.extraction.raster_cache import RasterCache
+
+
+def fake_convert_from_path(pdf_path, first_page, last_page, output_folder, thread_count, fmt, **kwargs):
+    """Mimic pdf2image with paths_only: each thread writes "<prefix>-<page>.<fmt>" under its own prefix.
+
+    The prefixes sort in the reverse of the thread order, like random uuid4 prefixes can.
+    """
+    assert os.path.isabs(output_folder)
+    page_count = last_page - first_page + 1
+    width = len(str(last_page))
+    paths = []
+    page = first_page
+    for thread in range(thread_count):
+        prefix = f"{'zyxwvu'[thread]}0f3c"
+        thread_pages = page_count // thread_count + int(thread < page_count % thread_count)
+        for _ in range(thread_pages):
+            path = os.path.join(output_folder, f"{prefix}-{page:0{width}d}.{fmt}")
+            with open(path, 'w') as f:
+                f.write(f"page {page}")
+            paths.append(path)
+            page += 1
+    return paths
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_render_keeps_page_order_with_several_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf2image, 'convert_from_path', fake_convert_from_path)
+    working_dir = tmp_path / 'cwd'
+    working_dir.mkdir()
+    monkeypatch.chdir(working_dir)
+    cache = RasterCache(directory='rasters')
+
+    paths = cache.render('resume.pdf', 'abc', range(1, 7), dpi=200, grayscale=True, thread_count=3)
+
+    assert {number: read(path) for number, path in paths.items()} == {
+        number: f"page {number}" for number in range(1, 7)
+    }
+    # Later lookups read the same pages back from the cache
+    assert read(cache.get('abc', 5, 200, True)) == "page 5"
+    # Everything was written inside the cache directory
+    assert all(os.path.dirname(path) == cache.directory for path in paths.values())
+    assert os.listdir(working_dir) == ['rasters']
@@ -0,0 +1,259 @@
+from utils import resume_analyzer
+from utils.resume_analyzer import ResumeAnalyzer
+from utils.resume_sections import get_segmenter
+
+JANE = """Jane Smith
+jane.smith@example.com | +1 555-123-4567 | linkedin.com/in/janesmith | github.com/janesmith
+
+PROFESSIONAL SUMMARY
+Backend engineer with six years of experience building Python services and data pipelines.
+
+WORK EXPERIENCE
+Senior Software Engineer, Acme Corp (2020 - 2024)
+- Developed REST APIs in Python and SQL serving 2M requests per day
+- Led a team of four engineers and improved deployment time by 40%
+
+Software Engineer, Initech (2018 - 2020)
+- Implemented ETL jobs on AWS with Docker
+
+EDUCATION
+B.Tech in Computer Science, State University, 2018
+GPA 3.8
+
+PROJECTS
+Resume parser - built a PDF parser in Python
+
+SKILLS
+Python, SQL, Docker, AWS, Git
+"""
+
+RAVI = """Ravi Kumar
+ravi@mail.com
+
+Objective
+To join a team where I can grow as a data analyst.
+
+Education
+MBA, City College
+Bachelor of Commerce
+
+Experience
+Intern at DataWorks
+Cleaned spreadsheets
+
+
+Skills
+Excel
+Tableau and Power BI
+Communication
+"""
+
+CERTIFICATE = """Certificate of Completion
+This certificate is awarded to Ravi Kumar for having completed the
+training course and qualified in the final assessment.
+Certification ID 12345
+"""
+
+REQUIREMENTS = {'required_skills': ['Python', 'SQL', 'Docker', 'Kubernetes', 'Excel'], 'require_gpa': True}
+
+# Outputs of the original line-by-line extractors (one keyword search per line and section) on the texts above
+EXPECTED_SECTIONS = {
+    'jane': {
+        'education': [
+            'jane.smith@example.com | +1 555-123-4567 | linkedin.com/in/janesmith | github.com/janesmith',
+            'B.Tech in Computer Science, State University, 2018 GPA 3.8',
+        ],
+        'experience': [
+            'Backend engineer with six years of experience building Python services and data pipelines.',
+            'Senior Software Engineer, Acme Corp (2020 - 2024) - Developed REST APIs in Python and SQL serving '
+            '2M requests per day - Led a team of four engineers and improved deployment time by 40%',
+            'Software Engineer, Initech (2018 - 2020) - Implemented ETL jobs on AWS with Docker',
+        ],
+        'projects': ['Resume parser - built a PDF parser in Python'],
+        'skills': ['AWS', 'Docker', 'Git', 'Python', 'SQL'],
+        'summary': '',
+    },
+    'ravi': {
+        'education': ['MBA, City College Bachelor of Commerce'],
+        'experience': [],
+        'projects': [],
+        'skills': [],
+        'summary': 'Ravi Kumar ravi@mail.com Objective To join a team where I can grow as a data analyst. '
+                   'Education To join a team where I can grow as a data analyst.',
+    },
+    'certificate': {
+        'education': ['Certification ID 12345'],
+        'experience': [],
+        'projects': [],
+        'skills': [],
+        'summary': 'Certificate of Completion This certificate is awarded to Ravi Kumar for having completed '
+                   'the training course and qualified in the final assessment. Certification ID 12345',
+    },
+}
+
+TEXTS = {'jane': JANE, 'ravi': RAVI, 'certificate': CERTIFICATE}
+
+# Results of the original analyze_resume for REQUIREMENTS; later versions only add keys
+EXPECTED_RESULTS = {
+    'jane': {
+        'name': 'Jane Smith',
+        'email': 'jane.smith@example.com',
+        'phone': '+1 555-123-4567',
+        'linkedin': 'linkedin.com/in/janesmith',
+        'github': 'github.com/janesmith',
+        'portfolio': '',
+        'ats_score': 85,
+        'document_type': 'resume',
+        'keyword_match': {
+            'score': 60.0,
+            'found_skills': ['Python', 'SQL', 'Docker'],
+            'missing_skills': ['Kubernetes', 'Excel'],
+        },
+        'section_score': 36.25,
+        'format_score': 100,
+        'education': EXPECTED_SECTIONS['jane']['education'],
+        'experience': EXPECTED_SECTIONS['jane']['experience'],
+        'projects': EXPECTED_SECTIONS['jane']['projects'],
+        'skills': EXPECTED_SECTIONS['jane']['skills'],
+        'summary': '',
+        'suggestions': [
+            'Add a professional summary to highlight your key qualifications',
+            'Add more skills that match the job requirements',
+        ],
+        'contact_suggestions': [],
+        'summary_suggestions': ['Add a professional summary to highlight your key qualifications'],
+        'skills_suggestions': ['Add more skills that match the job requirements'],
+        'experience_suggestions': [],
+        'education_suggestions': [],
+        'format_suggestions': [],
+        'section_scores': {
+            'contact': 100, 'summary': 67, 'skills': 60.0, 'experience': 100, 'education': 100, 'format': 100,
+        },
+    },
+    'ravi': {
+        'name': 'Ravi Kumar',
+        'email': 'ravi@mail.com',
+        'phone': '',
+        'linkedin': '',
+        'github': '',
+        'portfolio': '',
+        'ats_score': 41,
+        'document_type': 'resume',
+        'keyword_match': {
+            'score': 20.0,
+            'found_skills': ['Excel'],
+            'missing_skills': ['Python', 'SQL', 'Docker', 'Kubernetes'],
+        },
+        'section_score': 25.0,
+        'format_score': 15,
+        'education': EXPECTED_SECTIONS['ravi']['education'],
+        'experience': [],
+        'projects': [],
+        'skills': [],
+        'summary': EXPECTED_SECTIONS['ravi']['summary'],
+        'suggestions': [
+            'Add your phone number',
+            'Add your LinkedIn profile URL',
+            'Expand your professional summary to better highlight your experience and goals',
+            'Add a dedicated skills section',
+            'List more relevant technical and soft skills',
+            'Add more skills that match the job requirements',
+            'Add your work experience section',
+            'Include graduation dates',
+            "Include your GPA if it's above 3.0",
+            'Resume is too short',
+            'No clear section headers found',
+            'No bullet points found for listing details',
+            'Inconsistent spacing between sections',
+        ],
+        'contact_suggestions': ['Add your phone number', 'Add your LinkedIn profile URL'],
+        'summary_suggestions': ['Expand your professional summary to better highlight your experience and goals'],
+        'skills_suggestions': [
+            'Add a dedicated skills section',
+            'List more relevant technical and soft skills',
+            'Add more skills that match the job requirements',
+        ],
+        'experience_suggestions': ['Add your work experience section'],
+        'education_suggestions': ['Include graduation dates', "Include your GPA if it's above 3.0"],
+        'format_suggestions': [
+            'Resume is too short',
+            'No clear section headers found',
+            'No bullet points found for listing details',
+            'Inconsistent spacing between sections',
+        ],
+        'section_scores': {
+            'contact': 50, 'summary': 67, 'skills': 20.0, 'experience': 75, 'education': 50, 'format': 15,
+        },
+    },
+    'certificate': {
+        'ats_score': 0,
+        'document_type': 'certificate',
+        'keyword_match': {'score': 0, 'found_skills': [], 'missing_skills': []},
+        'section_score': 0,
+        'format_score': 0,
+        'suggestions': ['This appears to be a certificate document. Please upload a resume for ATS analysis.'],
+    },
+}
+
+
+def original_fields(result, expected):
+    """The keys of `result` the original analyzer returned, with skills in a stable order"""
+    fields = {key: result[key] for key in expected}
+    fields['keyword_match'] = {key: result['keyword_match'][key] for key in expected['keyword_match']}
+    if 'skills' in fields:
+        fields['skills'] = sorted(fields['skills'])
+    return fields
+
+
+def test_section_extraction_matches_the_original_extractors():
+    analyzer = ResumeAnalyzer()
+    for name, text in TEXTS.items():
+        sections = {
+            'education': analyzer.extract_education(text),
+            'experience': analyzer.extract_experience(text),
+            'projects': analyzer.extract_projects(text),
+            'skills': sorted(analyzer.extract_skills(text)),
+            'summary': analyzer.extract_summary(text),
+        }
+        assert sections == EXPECTED_SECTIONS[name], name
+
+
+def test_segmenter_entries():
+    segmenter = get_segmenter(tuple(ResumeAnalyzer().document_types['resume']))
+    sections = segmenter.segment(JANE)
+
+    assert sections.entries('education') == EXPECTED_SECTIONS['jane']['education']
+    assert sections.entries('projects') == EXPECTED_SECTIONS['jane']['projects']
+    assert 'education' in sections
+    assert 'summary' not in sections
+
+
+def test_analyze_resume_matches_the_original_results():
+    analyzer = ResumeAnalyzer()
+    for name, text in TEXTS.items():
+        result = analyzer.analyze_resume({'raw_text': text}, REQUIREMENTS, use_cache=False)
+        assert original_fields(result, EXPECTED_RESULTS[name]) == EXPECTED_RESULTS[name], name
+
+
+def test_cached_results_match_uncached_ones():
+    analyzer = ResumeAnalyzer()
+    other_role = {'required_skills': ['Excel', 'Tableau']}
+    edited = JANE.replace('Led a team of four', 'Managed a team of six')
+    for text in (JANE, JANE, edited):
+        for requirements in (REQUIREMENTS, other_role):
+            cached = analyzer.analyze_resume({'raw_text': text}, requirements)
+            fresh = analyzer.analyze_resume({'raw_text': text}, requirements, use_cache=False)
+            cached.pop('timings')
+            fresh.pop('timings')
+            assert cached == fresh
+
+
+def test_use_cache_false_leaves_the_caches_alone(monkeypatch):
+    for name in ('_result_cache', '_document_cache', '_section_cache'):
+        monkeypatch.setattr(resume_analyzer, name, resume_analyzer.LRUCache(16))
+
+    ResumeAnalyzer().analyze_resume({'raw_text': RAVI}, REQUIREMENTS, use_cache=False)
+
+    assert len(resume_analyzer._result_cache) == 0
+    assert len(resume_analyzer._document_cache) == 0
+    assert len(resume_analyzer._section_cache) == 0
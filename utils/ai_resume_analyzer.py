@@ -2,14 +2,51 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 import google.generativeai as genai
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-import tempfile
 import requests
 import json
 import math
+import itertools
 import re
+import time
+
+from .extraction import extract_document
+from .timings import StageTimer
+from .llm_cache import get_response_cache
+from .llm_client import get_llm_client
+from .analysis_sections import SectionIndex, SectionStream, get_section_index
+from .analysis_schema import RESPONSE_SCHEMA, StructuredAnalysis
+
+# Gemini model used for analyses
+GEMINI_MODEL = "gemini-1.5-flash"
+
+# Bump whenever the analysis prompt changes so cached responses are not reused
+PROMPT_VERSION = "1"
+
+# Asks Gemini for a JSON response following RESPONSE_SCHEMA instead of markdown
+STRUCTURED_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": RESPONSE_SCHEMA
+}
+
+
+def clean_markdown(text):
+    """Strip markdown formatting from a line or section of the analysis"""
+    if not text:
+        return ""
+
+    # Remove markdown formatting for bold and italic
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
+    text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
+    text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
+    text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
+
+    # Remove markdown formatting for headers
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+
+    # Remove markdown formatting for links
+    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+
+    return text.strip()
 
 
 class AIResumeAnalyzer:
@@ -23,166 +60,178 @@ class AIResumeAnalyzer:
         
         if self.google_api_key:
             genai.configure(api_key=self.google_api_key)
+        
+        # Ask Gemini for typed JSON fields instead of free-form markdown
+        self.structured_output = os.getenv("GEMINI_STRUCTURED_OUTPUT", "false").lower() == "true"
     
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF using pdfplumber and OCR if needed"""
-        text = ""
+        result = self.extract_document(pdf_file, kind='pdf')
+        if result.error:
+            st.error(result.error)
+        return result.text
+    
+    def extract_text_from_docx(self, docx_file):
+        """Extract text from DOCX file"""
+        result = self.extract_document(docx_file, kind='docx')
+        if result.error:
+            st.error(result.error)
+        return result.text
+    
+    def extract_document(self, file, kind=None):
+        """Run the shared extraction pipeline and report warnings in the UI.
         
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            if hasattr(pdf_file, 'getbuffer'):
-                temp_file.write(pdf_file.getbuffer())
-            elif hasattr(pdf_file, 'read'):
-                temp_file.write(pdf_file.read())
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                temp_file.write(pdf_file)
-            temp_path = temp_file.name
+        Returns the ExtractionResult; callers decide how to present
+        result.error (e.g. "extraction failed: timeout").
+        """
+        result = extract_document(file, kind=kind)
+        for message in result.warnings:
+            st.warning(message)
         
-        try:
-            # Try direct text extraction with pdfplumber
-            try:
-                with pdfplumber.open(temp_path) as pdf:
-                    for page in pdf.pages:
-                        try:
-                            # Suppress specific warnings about PDFColorSpace conversion
-                            import warnings
-                            with warnings.catch_warnings():
-                                warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
-                                warnings.filterwarnings("ignore", message=".*Cannot convert.*")
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text += page_text + "\n"
-                        except Exception as e:
-                            # Don't show these specific errors to the user
-                            if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
-                                st.warning(f"Error extracting text from page with pdfplumber: {e}")
-            except Exception as e:
-                st.warning(f"pdfplumber extraction failed: {e}")
-            
-            # If pdfplumber extraction worked, return the text
-            if text.strip():
-                os.unlink(temp_path)  # Clean up the temp file
-                return text.strip()
-            
-            # Try PyPDF2 as a fallback
-            st.info("Trying PyPDF2 extraction method...")
-            try:
-                import PyPDF2
-                pdf_text = ""
-                with open(temp_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pdf_text += page_text + "\n"
-                
-                if pdf_text.strip():
-                    os.unlink(temp_path)  # Clean up the temp file
-                    return pdf_text.strip()
-            except Exception as e:
-                st.warning(f"PyPDF2 extraction failed: {e}")
+        if result.error:
+            return result
+        
+        if 'ocr' in result.backends and result.kind == 'pdf':
+            st.info("Some pages had no text layer and were processed with OCR.")
+        
+        if not result.text:
+            st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
+            if result.kind == 'pdf':
+                st.info("If you're on Windows, make sure Poppler and Tesseract OCR are installed and in your PATH.")
+                st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
+        return result
+    
+    def _build_gemini_prompt(self, resume_text, job_description=None, job_role=None):
+        """Return the analysis prompt; bump PROMPT_VERSION when changing it"""
+        base_prompt = f"""
+        You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
+        
+        Please structure your response in the following format:
+        
+        ## Overall Assessment
+        [Provide a detailed assessment of the resume's overall quality, effectiveness, and alignment with industry standards. Include specific observations about formatting, content organization, and general impression. Be thorough and specific.]
+        
+        ## Professional Profile Analysis
+        [Analyze the candidate's professional profile, experience trajectory, and career narrative. Discuss how well their story comes across and whether their career progression makes sense for their apparent goals.]
+        
+        ## Skills Analysis
+        - **Current Skills**: [List ALL skills the candidate demonstrates in their resume, categorized by type (technical, soft, domain-specific, etc.). Be comprehensive.]
+        - **Skill Proficiency**: [Assess the apparent level of expertise in key skills based on how they're presented in the resume]
+        - **Missing Skills**: [List important skills that would improve the resume for their target role. Be specific and explain why each skill matters.]
+        
+        ## Experience Analysis
+        [Provide detailed feedback on how well the candidate has presented their experience. Analyze the use of action verbs, quantifiable achievements, and relevance to their target role. Suggest specific improvements.]
+        
+        ## Education Analysis
+        [Analyze the education section, including relevance of degrees, certifications, and any missing educational elements that would strengthen their profile.]
+        
+        ## Key Strengths
+        [List 5-7 specific strengths of the resume with detailed explanations of why these are effective]
+        
+        ## Areas for Improvement
+        [List 5-7 specific areas where the resume could be improved with detailed, actionable recommendations]
+        
+        ## ATS Optimization Assessment
+        [Analyze how well the resume is optimized for Applicant Tracking Systems. Provide a specific ATS score from 0-100, with 100 being perfectly optimized. Use this format: "ATS Score: XX/100". Then suggest specific keywords and formatting changes to improve ATS performance.]
+        
+        ## Recommended Courses/Certifications
+        [Suggest 5-7 specific courses or certifications that would enhance the candidate's profile, with a brief explanation of why each would be valuable]
+        
+        ## Resume Score
+        [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
+        
+        Resume:
+        {resume_text}
+        """
+        
+        if job_role:
+            base_prompt += f"""
             
-            # If we got here, both extraction methods failed
-            st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
+            The candidate is targeting a role as: {job_role}
             
-            # Try OCR as a last resort
-            try:
-                # Check if we can import the required OCR libraries
-                import pytesseract
-                from pdf2image import convert_from_path
-                
-                st.info("Attempting OCR for image-based PDF. This may take a moment...")
-                
-                # Check if poppler is installed
-                poppler_path = None
-                if os.name == 'nt':  # Windows
-                    # Try to find poppler in common locations
-                    possible_paths = [
-                        r'C:\poppler\Library\bin',
-                        r'C:\Program Files\poppler\bin',
-                        r'C:\Program Files (x86)\poppler\bin',
-                        r'C:\poppler\bin'
-                    ]
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            poppler_path = path
-                            st.success(f"Found Poppler at: {path}")
-                            break
-                    
-                    if not poppler_path:
-                        st.warning("Poppler not found in common locations. Using default path: C:\\poppler\\Library\\bin")
-                        poppler_path = r'C:\poppler\Library\bin'
-                
-                # Try to convert PDF to images
-                try:
-                    if poppler_path and os.name == 'nt':
-                        images = convert_from_path(temp_path, poppler_path=poppler_path)
-                    else:
-                        images = convert_from_path(temp_path)
-                    
-                    # Process each image with OCR
-                    ocr_text = ""
-                    for i, image in enumerate(images):
-                        st.info(f"Processing page {i+1} with OCR...")
-                        page_text = pytesseract.image_to_string(image)
-                        ocr_text += page_text + "\n"
-                    
-                    if ocr_text.strip():
-                        os.unlink(temp_path)  # Clean up the temp file
-                        return ocr_text.strip()
-                    else:
-                        st.error("OCR extraction yielded no text. Please check if the PDF contains actual text content.")
-                except Exception as e:
-                    st.error(f"PDF to image conversion failed: {e}")
-                    st.info("If you're on Windows, make sure Poppler is installed and in your PATH.")
-                    st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except ImportError as e:
-                st.error(f"OCR libraries not available: {e}")
-                st.info("Please install the required OCR libraries:")
-                st.code("pip install pytesseract pdf2image")
-                st.info("For Windows, also download and install:")
-                st.info("1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
-                st.info("2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except Exception as e:
-                st.error(f"OCR processing failed: {e}")
-        
-        except Exception as e:
-            st.error(f"PDF processing failed: {e}")
+            ## Role Alignment Analysis
+            [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
+            """
         
-        # Clean up the temp file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+        if job_description:
+            base_prompt += f"""
+            
+            Additionally, compare this resume to the following job description:
+            
+            Job Description:
+            {job_description}
+            
+            ## Job Match Analysis
+            [Provide a detailed analysis of how well the resume matches the job description, with a match percentage and specific areas of alignment and misalignment]
+            
+            ## Key Job Requirements Not Met
+            [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
+            """
         
-        # If all extraction methods failed, return an empty string
-        st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
-        return ""
+        return base_prompt
     
-    def extract_text_from_docx(self, docx_file):
-        """Extract text from DOCX file"""
-        from docx import Document
+    def _build_structured_prompt(self, resume_text, job_description=None, job_role=None):
+        """Return the prompt for JSON mode; the response layout is enforced by RESPONSE_SCHEMA"""
+        prompt = f"""
+        You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Analyze the resume below and fill in every field of the response:
         
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            temp_file.write(docx_file.getbuffer())
-            temp_path = temp_file.name
+        - overall_assessment: detailed assessment of the resume's overall quality, formatting, organization and alignment with industry standards
+        - professional_profile: the candidate's profile, experience trajectory and career narrative
+        - current_skills: every skill the resume demonstrates, one per item
+        - skill_proficiency: the apparent level of expertise in the key skills
+        - missing_skills: important skills that would improve the resume for the target role, one per item
+        - experience_analysis: how well the experience is presented (action verbs, quantified achievements, relevance) with specific improvements
+        - education_analysis: relevance of degrees and certifications and any missing elements
+        - strengths: 5-7 specific strengths, each with why it is effective
+        - weaknesses: 5-7 specific areas for improvement, each with an actionable recommendation
+        - ats_score: 0-100, how well the resume is optimized for Applicant Tracking Systems
+        - ats_assessment: keywords and formatting changes that would improve ATS performance
+        - recommended_courses: 5-7 courses or certifications, each with why it is valuable
+        - resume_score: 0-100 overall quality; significant issues score below 60, average 60-75, good 75-85, excellent 85-100
         
-        text = ""
-        try:
-            doc = Document(temp_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        except Exception as e:
-            st.error(f"Error extracting text from DOCX: {e}")
+        Resume:
+        {resume_text}
+        """
         
-        os.unlink(temp_path)  # Clean up the temp file
-        return text
+        if job_role:
+            prompt += f"""
+            The candidate is targeting a role as: {job_role}
+            - role_alignment: how well the resume aligns with this role, with specific recommendations
+            """
+        
+        if job_description:
+            prompt += f"""
+            Job Description:
+            {job_description}
+            - job_match: how well the resume matches the job description, with a match percentage
+            - requirements_not_met: requirements of the job description the resume does not address, each with how to address it
+            """
+        
+        return prompt
     
-    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None):
-        """Analyze resume using Google Gemini AI"""
+    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None, timer=None, use_cache=True,
+                                   structured=None):
+        """Analyze resume using Google Gemini AI
+
+        With structured=True (default: GEMINI_STRUCTURED_OUTPUT) Gemini answers
+        in JSON following RESPONSE_SCHEMA. The response is parsed once into a
+        StructuredAnalysis; the markdown, scores, strengths, weaknesses,
+        skills and courses of the result are all taken from it, with no text
+        scanning.
+
+        Responses are cached on disk by resume text, role, job description,
+        prompt version and model, so repeating an analysis does not call the
+        API again; cached results carry "cached": True.
+
+        Stage durations are returned in 'timings' (milliseconds). When a caller
+        passes its own StageTimer the stages are added to it instead.
+        """
+        own_timer = timer is None
+        if own_timer:
+            timer = StageTimer('ai')
+        if structured is None:
+            structured = self.structured_output
+        
         if not resume_text:
             return {"error": "Resume text is required for analysis."}
         
@@ -190,92 +239,153 @@ class AIResumeAnalyzer:
             return {"error": "Google API key is not configured. Please add it to your .env file."}
         
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            
-            base_prompt = f"""
-            You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
-            
-            Please structure your response in the following format:
-            
-            ## Overall Assessment
-            [Provide a detailed assessment of the resume's overall quality, effectiveness, and alignment with industry standards. Include specific observations about formatting, content organization, and general impression. Be thorough and specific.]
-            
-            ## Professional Profile Analysis
-            [Analyze the candidate's professional profile, experience trajectory, and career narrative. Discuss how well their story comes across and whether their career progression makes sense for their apparent goals.]
-            
-            ## Skills Analysis
-            - **Current Skills**: [List ALL skills the candidate demonstrates in their resume, categorized by type (technical, soft, domain-specific, etc.). Be comprehensive.]
-            - **Skill Proficiency**: [Assess the apparent level of expertise in key skills based on how they're presented in the resume]
-            - **Missing Skills**: [List important skills that would improve the resume for their target role. Be specific and explain why each skill matters.]
-            
-            ## Experience Analysis
-            [Provide detailed feedback on how well the candidate has presented their experience. Analyze the use of action verbs, quantifiable achievements, and relevance to their target role. Suggest specific improvements.]
-            
-            ## Education Analysis
-            [Analyze the education section, including relevance of degrees, certifications, and any missing educational elements that would strengthen their profile.]
-            
-            ## Key Strengths
-            [List 5-7 specific strengths of the resume with detailed explanations of why these are effective]
-            
-            ## Areas for Improvement
-            [List 5-7 specific areas where the resume could be improved with detailed, actionable recommendations]
-            
-            ## ATS Optimization Assessment
-            [Analyze how well the resume is optimized for Applicant Tracking Systems. Provide a specific ATS score from 0-100, with 100 being perfectly optimized. Use this format: "ATS Score: XX/100". Then suggest specific keywords and formatting changes to improve ATS performance.]
-            
-            ## Recommended Courses/Certifications
-            [Suggest 5-7 specific courses or certifications that would enhance the candidate's profile, with a brief explanation of why each would be valuable]
-            
-            ## Resume Score
-            [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
-            
-            Resume:
-            {resume_text}
-            """
-            
-            if job_role:
-                base_prompt += f"""
-                
-                The candidate is targeting a role as: {job_role}
-                
-                ## Role Alignment Analysis
-                [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
-                """
-            
-            if job_description:
-                base_prompt += f"""
-                
-                Additionally, compare this resume to the following job description:
-                
-                Job Description:
-                {job_description}
-                
-                ## Job Match Analysis
-                [Provide a detailed analysis of how well the resume matches the job description, with a match percentage and specific areas of alignment and misalignment]
-                
-                ## Key Job Requirements Not Met
-                [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
-                """
-            
-            response = model.generate_content(base_prompt)
-            analysis = response.text.strip()
-            
-            # Extract resume score if present
-            resume_score = self._extract_score_from_text(analysis)
-            
-            # Extract ATS score if present
-            ats_score = self._extract_ats_score_from_text(analysis)
-            
-            return {
-                "analysis": analysis,
-                "resume_score": resume_score,
-                "ats_score": ats_score
-            }
+            cache = get_response_cache() if use_cache else None
+            if cache is not None:
+                with timer.stage('cache_lookup'):
+                    cache_key = cache.make_key(
+                        resume_text, job_role, job_description, self._prompt_version(structured), GEMINI_MODEL
+                    )
+                    cached = cache.get(cache_key)
+                if cached is not None:
+                    result = dict(cached, cached=True)
+                    if own_timer:
+                        result["timings"] = timer.finish()
+                    return result
+            
+            client = get_llm_client(GEMINI_MODEL)
+            if structured:
+                prompt = self._build_structured_prompt(resume_text, job_description, job_role)
+                with timer.stage('llm_call'):
+                    response = client.generate(prompt, generation_config=STRUCTURED_GENERATION_CONFIG)
+                with timer.stage('score_parsing'):
+                    result = self._structured_result(StructuredAnalysis.from_json(response))
+            else:
+                base_prompt = self._build_gemini_prompt(resume_text, job_description, job_role)
+                with timer.stage('llm_call'):
+                    analysis = client.generate(base_prompt).strip()
+                with timer.stage('score_parsing'):
+                    result = self._gemini_result(analysis)
+            if cache is not None and result["analysis"]:
+                cache.set(cache_key, result)
+            if own_timer:
+                result["timings"] = timer.finish()
+            return result
         
         except Exception as e:
             return {"error": f"Analysis failed: {str(e)}"}
 
-    
+    @staticmethod
+    def _prompt_version(structured):
+        return f"{PROMPT_VERSION}:{'json' if structured else 'markdown'}"
+
+    def _structured_result(self, parsed):
+        """Build the result dict of a JSON-mode analysis from its parsed fields"""
+        return {
+            "analysis": parsed.to_markdown(),
+            "resume_score": parsed.resume_score,
+            "ats_score": parsed.ats_score,
+            "strengths": parsed.strengths,
+            "weaknesses": parsed.weaknesses,
+            "suggestions": parsed.recommended_courses,
+            "skills": parsed.current_skills,
+            "missing_skills": parsed.missing_skills,
+            "structured": parsed.to_dict()
+        }
+
+    def _gemini_result(self, analysis):
+        """Build the result dict of a Gemini analysis from its markdown"""
+        result = {"analysis": analysis}
+        # Extract resume score if present
+        result["resume_score"] = self._extract_score_from_text(result)
+        # Extract ATS score if present
+        result["ats_score"] = self._extract_ats_score_from_text(result)
+        return result
+
+    def analyze_resume_with_gemini_stream(self, resume_text, job_description=None, job_role=None, use_cache=True,
+                                          structured=None):
+        """Analyze resume using Google Gemini AI, yielding the analysis as it is generated
+
+        Yields event dicts:
+        - {"event": "section", "title": ..., "markdown": ...} as each "## " section completes
+        - {"event": "score", "name": "resume_score" or "ats_score", "value": ...} as soon as
+          the section holding that score has arrived
+        - {"event": "done", "result": ...} last, with the same result as analyze_resume_with_gemini
+        - {"event": "error", "error": ...} instead of "done" if the analysis failed
+
+        A cached analysis is replayed section by section without calling the API.
+        JSON responses (structured=True) cannot be split while they stream, so
+        their sections are replayed once the response has been parsed, and
+        their score events carry the parsed scores.
+        """
+        timer = StageTimer('ai_stream')
+        if structured is None:
+            structured = self.structured_output
+        
+        if not resume_text:
+            yield {"event": "error", "error": "Resume text is required for analysis."}
+            return
+        
+        if not self.google_api_key:
+            yield {"event": "error", "error": "Google API key is not configured. Please add it to your .env file."}
+            return
+        
+        try:
+            result = None
+            cache = get_response_cache() if use_cache and not structured else None
+            if structured:
+                result = self.analyze_resume_with_gemini(
+                    resume_text, job_description, job_role, timer=timer, use_cache=use_cache, structured=True
+                )
+                if "error" in result:
+                    yield {"event": "error", "error": result["error"]}
+                    return
+            elif cache is not None:
+                with timer.stage('cache_lookup'):
+                    cache_key = cache.make_key(
+                        resume_text, job_role, job_description, self._prompt_version(False), GEMINI_MODEL
+                    )
+                    cached = cache.get(cache_key)
+                if cached is not None:
+                    result = dict(cached, cached=True)
+            
+            if result is not None:
+                chunks = [result["analysis"]]
+            else:
+                prompt = self._build_gemini_prompt(resume_text, job_description, job_role)
+                chunks = get_llm_client(GEMINI_MODEL).stream(prompt)
+            
+            sections = SectionStream()
+            received = []
+            first_section = True
+            for chunk in itertools.chain(chunks, [None]):
+                if chunk is None:
+                    completed = sections.close()
+                else:
+                    received.append(chunk)
+                    completed = sections.feed(chunk)
+                for title, markdown in completed:
+                    if first_section:
+                        timer.mark('first_section')
+                        first_section = False
+                    yield {"event": "section", "title": title, "markdown": markdown}
+                    # JSON responses carry typed scores; only markdown has to be scanned for them
+                    if title.startswith("Resume Score"):
+                        score = result["resume_score"] if structured else self._extract_score_from_text(markdown)
+                        yield {"event": "score", "name": "resume_score", "value": score}
+                    elif title.startswith("ATS Optimization Assessment"):
+                        score = result["ats_score"] if structured else self._extract_ats_score_from_text(markdown)
+                        yield {"event": "score", "name": "ats_score", "value": score}
+            
+            if result is None:
+                result = self._gemini_result(''.join(received).strip())
+                if cache is not None and result["analysis"]:
+                    cache.set(cache_key, result)
+            result["timings"] = timer.finish()
+            yield {"event": "done", "result": result}
+        
+        except Exception as e:
+            yield {"event": "error", "error": f"Analysis failed: {str(e)}"}
+
     def generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a PDF report of the analysis"""
         try:
@@ -299,25 +409,6 @@ class AIResumeAnalyzer:
                 st.info("Please make sure reportlab is installed: pip install reportlab")
                 return self.simple_generate_pdf_report(analysis_result, candidate_name, job_role)
             
-            # Helper function to clean markdown formatting
-            def clean_markdown(text):
-                if not text:
-                    return ""
-                
-                # Remove markdown formatting for bold and italic
-                text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
-                text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
-                text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
-                text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
-                
-                # Remove markdown formatting for headers
-                text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-                
-                # Remove markdown formatting for links
-                text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-                
-                return text.strip()
-            
             # Validate input data
             if not analysis_result:
                 st.error("No analysis result provided for PDF generation")
@@ -629,7 +720,8 @@ class AIResumeAnalyzer:
             content.append(Spacer(1, 0.25*inch))
             
             # Analysis Content
-            analysis_text = analysis_result.get("full_response", "")
+            sections = get_section_index(analysis_result)
+            analysis_text = sections.text
             
             # Extract key sections for the executive summary
             strengths = analysis_result.get("strengths", [])
@@ -637,18 +729,14 @@ class AIResumeAnalyzer:
             
             # If strengths and weaknesses are not in the structured data, try to extract from text
             if not strengths:
-                if "## Key Strengths" in analysis_text:
-                    strengths_section = analysis_text.split("## Key Strengths")[1].split("##")[0].strip()
+                if "Key Strengths" in sections:
+                    strengths_section = sections.get("Key Strengths")
                     strengths = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
                                 for s in strengths_section.split("\n") 
                                 if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
                 
                 # Try another pattern for strengths
-                if not strengths and "Key Strengths" in analysis_text:
-                    strengths_section = analysis_text.split("Key Strengths")[1]
-                    if "Areas for Improvement" in strengths_section:
-                        strengths_section = strengths_section.split("Areas for Improvement")[0]
-                    
+                if not strengths and "Key Strengths" in sections:
                     # Extract lines that look like list items
                     for line in strengths_section.split("\n"):
                         line = line.strip()
@@ -658,18 +746,14 @@ class AIResumeAnalyzer:
                             strengths.append(clean_markdown(line))
 
             if not weaknesses:
-                if "## Areas for Improvement" in analysis_text:
-                    weaknesses_section = analysis_text.split("## Areas for Improvement")[1].split("##")[0].strip()
+                if "Areas for Improvement" in sections:
+                    weaknesses_section = sections.get("Areas for Improvement")
                     weaknesses = [clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
                                  for w in weaknesses_section.split("\n") 
                                  if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•"))]
                 
                 # Try another pattern for weaknesses
-                if not weaknesses and "Areas for Improvement" in analysis_text:
-                    weaknesses_section = analysis_text.split("Areas for Improvement")[1]
-                    if "##" in weaknesses_section:
-                        weaknesses_section = weaknesses_section.split("##")[0]
-                    
+                if not weaknesses and "Areas for Improvement" in sections:
                     # Extract lines that look like list items
                     for line in weaknesses_section.split("\n"):
                         line = line.strip()
@@ -750,9 +834,8 @@ class AIResumeAnalyzer:
 
             # Extract overall assessment
             overall_assessment = ""
-            if "## Overall Assessment" in analysis_text:
-                overall_section = analysis_text.split("## Overall Assessment")[1].split("##")[0].strip()
-                overall_assessment = clean_markdown(overall_section)
+            if "Overall Assessment" in sections:
+                overall_assessment = clean_markdown(sections.get("Overall Assessment"))
 
             content.append(Paragraph(overall_assessment, normal_style))
             content.append(Spacer(1, 0.2*inch))
@@ -820,9 +903,6 @@ class AIResumeAnalyzer:
             content.append(Paragraph("Detailed Analysis", heading_style))
             content.append(Spacer(1, 0.1*inch))
             
-            # Parse the markdown-like content
-            sections = analysis_text.split("##")
-            
             # Define sections to include in detailed analysis
             detailed_sections = [
                 "Professional Profile Analysis",
@@ -834,13 +914,7 @@ class AIResumeAnalyzer:
                 "Job Match Analysis"
             ]
             
-            for section in sections:
-                if not section.strip():
-                    continue
-                
-                # Extract section title and content
-                lines = section.strip().split("\n")
-                section_title = lines[0].strip()
+            for section_title, section_content in sections.sections():
                 
                 # Skip sections we don't want in the detailed analysis
                 if section_title not in detailed_sections and section_title != "Overall Assessment":
@@ -850,8 +924,6 @@ class AIResumeAnalyzer:
                 if section_title == "Overall Assessment":
                     continue
                 
-                section_content = "\n".join(lines[1:]).strip()
-                
                 # Add section title
                 content.append(Paragraph(section_title, subheading_style))
                 content.append(Spacer(1, 0.1*inch))
@@ -964,18 +1036,14 @@ class AIResumeAnalyzer:
                 course_recommendations = analysis_result.get("suggestions", [])
             
             # If still no recommendations, try to extract from text
-            if not course_recommendations and "## Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
+            if not course_recommendations and "Recommended Courses" in sections:
+                recommendations_section = sections.get("Recommended Courses")
                 course_recommendations = [clean_markdown(r.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
                               for r in recommendations_section.split("\n") 
                               if r.strip() and (r.strip().startswith("-") or r.strip().startswith("*") or r.strip().startswith("•"))]
             
             # Try another pattern for course recommendations
-            if not course_recommendations and "Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("Recommended Courses")[1]
-                if "##" in recommendations_section:
-                    recommendations_section = recommendations_section.split("##")[0]
-                
+            if not course_recommendations and "Recommended Courses" in sections:
                 # Extract lines that look like list items
                 for line in recommendations_section.split("\n"):
                     line = line.strip()
@@ -1099,68 +1167,71 @@ class AIResumeAnalyzer:
             st.code(traceback.format_exc())
             return None
             
+    def _skill_entry_items(self, analysis, label):
+        """List items of one labeled entry (e.g. "Current Skills") of the Skills Analysis section"""
+        sections = get_section_index(analysis)
+        skills_section = sections.get("Skills Analysis") or sections.text
+        if label not in skills_section:
+            return []
+        
+        items = []
+        for number, line in enumerate(skills_section.split(label, 1)[1].split("\n")):
+            # The next "- **Label**:" entry ends this one
+            if number and line.strip().startswith("- **"):
+                break
+            if line.strip() and ("-" in line or "*" in line or "•" in line):
+                item = line.replace("-", "").replace("*", "").replace("•", "").strip().lstrip(":").strip()
+                if item:
+                    items.append(item)
+        return items
+    
     def extract_skills_from_analysis(self, analysis_text):
-        """Extract skills from the analysis text"""
-        skills = []
+        """Extract skills from the analysis text, or take them from a structured result dict"""
+        if isinstance(analysis_text, dict) and "skills" in analysis_text:
+            return list(analysis_text["skills"])
         
         try:
-            if "Current Skills" in analysis_text:
-                skills_section = analysis_text.split("Current Skills")[1]
-                if "##" in skills_section:
-                    skills_section = skills_section.split("##")[0]
-                
-                for line in skills_section.split("\n"):
-                    if line.strip() and ("-" in line or "*" in line or "•" in line):
-                        skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                        if skill:
-                            skills.append(skill)
+            return self._skill_entry_items(analysis_text, "Current Skills")
         except Exception as e:
             st.warning(f"Error extracting skills: {str(e)}")
-        
-        return skills
+            return []
         
     def extract_missing_skills_from_analysis(self, analysis_text):
-        """Extract missing skills from the analysis text"""
-        missing_skills = []
+        """Extract missing skills from the analysis text, or take them from a structured result dict"""
+        if isinstance(analysis_text, dict) and "missing_skills" in analysis_text:
+            return list(analysis_text["missing_skills"])
         
         try:
-            if "Missing Skills" in analysis_text:
-                missing_section = analysis_text.split("Missing Skills")[1]
-                if "##" in missing_section:
-                    missing_section = missing_section.split("##")[0]
-                
-                for line in missing_section.split("\n"):
-                    if line.strip() and ("-" in line or "*" in line or "•" in line):
-                        skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                        if skill:
-                            missing_skills.append(skill)
+            return self._skill_entry_items(analysis_text, "Missing Skills")
         except Exception as e:
             st.warning(f"Error extracting missing skills: {str(e)}")
-        
-        return missing_skills
+            return []
     
     def _extract_score_from_text(self, analysis_text):
-        """Extract the resume score from the analysis text"""
+        """Extract the resume score from the analysis text (or result dict)"""
         try:
+            sections = get_section_index(analysis_text)
+            
             # Look for the Resume Score section
-            if "## Resume Score" in analysis_text:
-                score_section = analysis_text.split("## Resume Score")[1].strip()
-                # Extract the first number found
-                score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', score_section)
+            title = sections.find("Resume Score")
+            if title is not None:
+                score_section = sections.get(title)
+                # The score may be written in the heading ("## Resume Score: 78/100") or in the body
+                score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', f"{title}\n{score_section}")
                 if score_match:
                     score = int(score_match.group(1))
                     # Ensure score is within valid range
                     return max(0, min(score, 100))
                 
-                # Try another pattern if the first one doesn't match
-                score_match = re.search(r'\b(\d{1,3})\b', score_section)
+                # Try another pattern if the first one doesn't match: the first number after the name
+                score_match = re.search(r'\b(\d{1,3})\b', f"{title[len('Resume Score'):]}\n{score_section}")
                 if score_match:
                     score = int(score_match.group(1))
                     # Ensure score is within valid range
                     return max(0, min(score, 100))
             
             # If no score found in Resume Score section, try to find it elsewhere
-            score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', analysis_text)
+            score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', sections.text)
             if score_match:
                 score = int(score_match.group(1))
                 return max(0, min(score, 100))
@@ -1171,13 +1242,14 @@ class AIResumeAnalyzer:
             return 0
             
     def _extract_ats_score_from_text(self, analysis_text):
-        """Extract the ATS score from the analysis text"""
+        """Extract the ATS score from the analysis text (or result dict)"""
         try:
-            # Look for the ATS Score in the ATS Optimization Assessment section
-            if "## ATS Optimization Assessment" in analysis_text:
-                ats_section = analysis_text.split("## ATS Optimization Assessment")[1].split("##")[0].strip()
+            # Look for the ATS Score in the ATS Optimization Assessment section, heading included
+            sections = get_section_index(analysis_text)
+            title = sections.find("ATS Optimization Assessment")
+            if title is not None:
                 # Extract the score using regex
-                score_match = re.search(r'ATS Score:\s*(\d{1,3})/100', ats_section)
+                score_match = re.search(r'ATS Score:\s*(\d{1,3})/100', f"{title}\n{sections.get(title)}")
                 if score_match:
                     score = int(score_match.group(1))
                     # Ensure score is within valid range
@@ -1202,6 +1274,7 @@ class AIResumeAnalyzer:
         """
         import traceback
         
+        timer = StageTimer('ai')
         try:
             job_description = None
             if role_info:
@@ -1213,7 +1286,7 @@ class AIResumeAnalyzer:
             
             # Choose the appropriate model for analysis
             if model == "Google Gemini":
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, timer=timer)
                 model_used = "Google Gemini"
             elif model == "Anthropic Claude":
                 result = self.analyze_resume_with_anthropic(resume_text, job_description, job_role)
@@ -1221,43 +1294,39 @@ class AIResumeAnalyzer:
                 model_used = result.get("model_used", "Anthropic Claude")
             else:
                 # Default to Gemini if model not recognized
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, timer=timer)
                 model_used = "Google Gemini"
             
             # Process the result to extract structured information
             analysis_text = result.get("analysis", "")
+            parse_start = time.perf_counter_ns()
             
-            # Extract strengths
-            strengths = []
-            if "## Key Strengths" in analysis_text:
-                strengths_section = analysis_text.split("## Key Strengths")[1].split("##")[0].strip()
-                strengths = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                            for s in strengths_section.split("\n") 
-                            if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
-            
-            # Extract weaknesses/areas for improvement
-            weaknesses = []
-            if "## Areas for Improvement" in analysis_text:
-                weaknesses_section = analysis_text.split("## Areas for Improvement")[1].split("##")[0].strip()
-                weaknesses = [clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                             for w in weaknesses_section.split("\n") 
-                             if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•"))]
-            
-            # Extract suggestions/recommendations
-            suggestions = []
-            if "## Recommended Courses" in analysis_text:
-                suggestions_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
-                suggestions = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                 for s in suggestions_section.split("\n") 
-                                 if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
+            if "strengths" in result:
+                # Structured (JSON mode) results already carry the typed lists
+                strengths = result["strengths"]
+                weaknesses = result["weaknesses"]
+                suggestions = result["suggestions"]
+            else:
+                # Strengths, areas for improvement and recommended courses, looked up in the parsed sections
+                sections = get_section_index(result)
+                strengths, weaknesses, suggestions = (
+                    [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
+                     for s in sections.get(title).split("\n") 
+                     if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
+                    for title in ("Key Strengths", "Areas for Improvement", "Recommended Courses")
+                )
             
             # Extract score
             score = result.get("resume_score", 0)
-            if not score:
-                score = self._extract_score_from_text(analysis_text)
+            if not score and "structured" not in result:
+                score = self._extract_score_from_text(result)
             
             # Extract ATS score
-            ats_score = self._extract_ats_score_from_text(analysis_text)
+            if "structured" in result:
+                ats_score = result["ats_score"]
+            else:
+                ats_score = self._extract_ats_score_from_text(result)
+            timer.add('section_parsing', time.perf_counter_ns() - parse_start)
             
             # Return structured analysis
             return {
@@ -1267,7 +1336,8 @@ class AIResumeAnalyzer:
                 "weaknesses": weaknesses,
                 "suggestions": suggestions,
                 "full_response": analysis_text,
-                "model_used": model_used
+                "model_used": model_used,
+                "timings": timer.finish()
             }
             
         except Exception as e:
@@ -1307,25 +1377,6 @@ class AIResumeAnalyzer:
                 st.info("Please make sure reportlab is installed: pip install reportlab")
                 return None
             
-            # Helper function to clean markdown formatting
-            def clean_markdown(text):
-                if not text:
-                    return ""
-                
-                # Remove markdown formatting for bold and italic
-                text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
-                text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
-                text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
-                text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
-                
-                # Remove markdown formatting for headers
-                text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-                
-                # Remove markdown formatting for links
-                text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-                
-                return text.strip()
-            
             # Validate input data
             if not analysis_result:
                 st.error("No analysis result provided for PDF generation")
@@ -1542,6 +1593,10 @@ class AIResumeAnalyzer:
             content.append(Paragraph("Resume Evaluation", heading_style))
             content.append(Spacer(1, 0.1*inch))
             
+            # Analysis Content
+            sections = get_section_index(analysis_result)
+            analysis_text = sections.text
+            
             # Extract scores
             resume_score = analysis_result.get("score", 0)
             if resume_score == 0:
@@ -1593,13 +1648,9 @@ class AIResumeAnalyzer:
             content.append(Spacer(1, 0.1*inch))
             
             # Extract overall assessment
-            analysis_text = analysis_result.get("full_response", "")
-            if not analysis_text:
-                analysis_text = analysis_result.get("analysis", "")
-                
             overall_assessment = ""
-            if "## Overall Assessment" in analysis_text:
-                overall_section = analysis_text.split("## Overall Assessment")[1].split("##")[0].strip()
+            if "Overall Assessment" in sections:
+                overall_section = sections.get("Overall Assessment")
                 overall_assessment = clean_markdown(overall_section)
             
             content.append(Paragraph(overall_assessment, normal_style))
@@ -1665,7 +1716,7 @@ class AIResumeAnalyzer:
             content.append(Spacer(1, 0.25*inch))
             
             # Use the process_sections method to handle detailed analysis
-            content = self.process_sections(analysis_text, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown)
+            content = self.process_sections(sections, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown)
             
             # Add course recommendations
             course_recommendations = []
@@ -1675,18 +1726,14 @@ class AIResumeAnalyzer:
                 course_recommendations = analysis_result.get("suggestions", [])
             
             # If still no recommendations, try to extract from text
-            if not course_recommendations and "## Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
+            if not course_recommendations and "Recommended Courses" in sections:
+                recommendations_section = sections.get("Recommended Courses")
                 course_recommendations = [clean_markdown(r.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
                               for r in recommendations_section.split("\n") 
                               if r.strip() and (r.strip().startswith("-") or r.strip().startswith("*") or r.strip().startswith("•"))]
             
             # Try another pattern for course recommendations
-            if not course_recommendations and "Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("Recommended Courses")[1]
-                if "##" in recommendations_section:
-                    recommendations_section = recommendations_section.split("##")[0]
-                
+            if not course_recommendations and "Recommended Courses" in sections:
                 # Extract lines that look like list items
                 for line in recommendations_section.split("\n"):
                     line = line.strip()
@@ -1811,9 +1858,8 @@ class AIResumeAnalyzer:
             return None 
 
     def process_sections(self, analysis_text, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown):
-        """Process sections of the analysis text with special handling for certain sections"""
-        # Parse the markdown-like content
-        sections = analysis_text.split("##")
+        """Process sections of the analysis (text, result dict or SectionIndex) with special handling for certain sections"""
+        sections = analysis_text if isinstance(analysis_text, SectionIndex) else get_section_index(analysis_text)
         
         # Define sections to include in detailed analysis
         detailed_sections = [
@@ -1830,13 +1876,7 @@ class AIResumeAnalyzer:
         content.append(Paragraph("Detailed Analysis", heading_style))
         content.append(Spacer(1, 0.1*inch))
         
-        for section in sections:
-            if not section.strip():
-                continue
-            
-            # Extract section title and content
-            lines = section.strip().split("\n")
-            section_title = lines[0].strip()
+        for section_title, section_content in sections.sections():
             
             # Skip sections we don't want in the detailed analysis
             if section_title not in detailed_sections and section_title != "Overall Assessment":
@@ -1846,8 +1886,6 @@ class AIResumeAnalyzer:
             if section_title == "Overall Assessment":
                 continue
             
-            section_content = "\n".join(lines[1:]).strip()
-            
             # Add section title
             content.append(Paragraph(section_title, subheading_style))
             content.append(Spacer(1, 0.1*inch))
@@ -0,0 +1,37 @@
+from .extraction import as_document
+
+
+class AnalysisContext:
+    """Per-resume state shared by every stage of ResumeAnalyzer.analyze_resume.
+
+    Built once per resume from its ResumeDocument: the lowercase text, the
+    token list, the line index and word counts are computed here and read
+    by the stages, so no stage lowercases or splits the text again. The
+    section map and the feature dict are filled in by the analyzer the
+    first time a stage asks for them.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self.text = document.text
+        self.lower = document.lower
+        self.lines = document.lines
+        self.tokens = self.lower.split()
+        self.word_count = len(self.tokens)
+        self.sections = None
+        self.features = None
+        self._word_counts = {}
+
+    def count_words(self, text):
+        """Word count of a derived string (e.g. the summary), computed once per string"""
+        count = self._word_counts.get(text)
+        if count is None:
+            count = self._word_counts[text] = len(text.split())
+        return count
+
+
+def as_context(text):
+    """Accept raw text, a ResumeDocument or an AnalysisContext and return an AnalysisContext"""
+    if isinstance(text, AnalysisContext):
+        return text
+    return AnalysisContext(as_document(text))
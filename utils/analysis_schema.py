@@ -0,0 +1,133 @@
+import json
+from dataclasses import dataclass, field, asdict, fields
+
+# JSON schema of the structured Gemini response (the OpenAPI subset accepted as response_schema)
+_TEXT = {"type": "STRING"}
+_LIST = {"type": "ARRAY", "items": {"type": "STRING"}}
+_SCORE = {"type": "INTEGER"}
+
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "overall_assessment": _TEXT,
+        "professional_profile": _TEXT,
+        "current_skills": _LIST,
+        "skill_proficiency": _TEXT,
+        "missing_skills": _LIST,
+        "experience_analysis": _TEXT,
+        "education_analysis": _TEXT,
+        "strengths": _LIST,
+        "weaknesses": _LIST,
+        "ats_score": _SCORE,
+        "ats_assessment": _TEXT,
+        "recommended_courses": _LIST,
+        "resume_score": _SCORE,
+        "role_alignment": _TEXT,
+        "job_match": _TEXT,
+        "requirements_not_met": _LIST,
+    },
+    "required": [
+        "overall_assessment", "current_skills", "missing_skills", "strengths", "weaknesses",
+        "ats_score", "ats_assessment", "recommended_courses", "resume_score"
+    ],
+}
+
+
+def _clean_text(value):
+    return str(value).strip() if value is not None else ''
+
+
+def _clean_list(value):
+    if isinstance(value, str):
+        value = [value]
+    items = (_clean_text(item) for item in (value or []))
+    return [item for item in items if item]
+
+
+def _clean_score(value):
+    try:
+        return max(0, min(int(round(float(value))), 100))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class StructuredAnalysis:
+    """A Gemini analysis returned in JSON mode, parsed once into typed fields.
+
+    The markdown shown to users and used by the PDF reports is rendered
+    from these fields with to_markdown(), in the same layout the markdown
+    prompt asks for.
+    """
+
+    resume_score: int = 0
+    ats_score: int = 0
+    overall_assessment: str = ''
+    professional_profile: str = ''
+    current_skills: list = field(default_factory=list)
+    skill_proficiency: str = ''
+    missing_skills: list = field(default_factory=list)
+    experience_analysis: str = ''
+    education_analysis: str = ''
+    strengths: list = field(default_factory=list)
+    weaknesses: list = field(default_factory=list)
+    ats_assessment: str = ''
+    recommended_courses: list = field(default_factory=list)
+    role_alignment: str = ''
+    job_match: str = ''
+    requirements_not_met: list = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, text):
+        """Parse the JSON response; raises ValueError if it is not a JSON object"""
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("Structured analysis must be a JSON object")
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an analysis from a dict, coercing every field to its type"""
+        values = {}
+        for item in fields(cls):
+            value = data.get(item.name)
+            if item.name.endswith('_score'):
+                values[item.name] = _clean_score(value)
+            elif item.type is list:
+                values[item.name] = _clean_list(value)
+            else:
+                values[item.name] = _clean_text(value)
+        return cls(**values)
+
+    def to_dict(self):
+        return asdict(self)
+
+    def to_markdown(self):
+        """Render the analysis in the section layout of the markdown prompt"""
+        def bullets(items):
+            return '\n'.join(f"- {item}" for item in items)
+
+        sections = [
+            ("Overall Assessment", self.overall_assessment),
+            ("Professional Profile Analysis", self.professional_profile),
+            ("Skills Analysis", '\n'.join(
+                f"- **{label}**: {value}"
+                for label, value in (
+                    ("Current Skills", ', '.join(self.current_skills)),
+                    ("Skill Proficiency", self.skill_proficiency),
+                    ("Missing Skills", ', '.join(self.missing_skills)),
+                )
+                if value
+            )),
+            ("Experience Analysis", self.experience_analysis),
+            ("Education Analysis", self.education_analysis),
+            ("Key Strengths", bullets(self.strengths)),
+            ("Areas for Improvement", bullets(self.weaknesses)),
+            ("ATS Optimization Assessment", f"ATS Score: {self.ats_score}/100\n\n{self.ats_assessment}".strip()),
+            ("Recommended Courses/Certifications", bullets(self.recommended_courses)),
+            ("Resume Score", f"Resume Score: {self.resume_score}/100"),
+            ("Role Alignment Analysis", self.role_alignment),
+            ("Job Match Analysis", self.job_match),
+            ("Key Job Requirements Not Met", bullets(self.requirements_not_met)),
+        ]
+        return '\n\n'.join(f"## {title}\n{body}" for title, body in sections if body)
@@ -0,0 +1,130 @@
+import re
+
+from .cache import LRUCache
+
+# Markdown headings the AI analysis is split on
+HEADING_PREFIX = '## '
+HEADING_RE = re.compile(r'^## ', re.MULTILINE)
+
+
+class SectionStream:
+    """Split streamed markdown into sections as soon as each one is complete.
+
+    Chunks can end anywhere, even in the middle of a heading. A section is
+    complete once the next '## ' heading starts or the stream is closed, so
+    every section is returned exactly once and in order. Sections are
+    (title, markdown) pairs; markdown includes the heading line, and text
+    before the first heading is returned with an empty title.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+
+    def feed(self, chunk):
+        """Add a chunk and return the sections it completed"""
+        scan_from = max(1, len(self._buffer) - len(HEADING_PREFIX))
+        self._buffer += chunk
+        completed = []
+        while True:
+            match = HEADING_RE.search(self._buffer, scan_from)
+            if match is None:
+                return completed
+            completed.extend(self._section(self._buffer[:match.start()]))
+            self._buffer = self._buffer[match.start():]
+            scan_from = 1
+
+    def close(self):
+        """Return the last section once the stream has ended"""
+        completed = self._section(self._buffer)
+        self._buffer = ''
+        return completed
+
+    @staticmethod
+    def _section(markdown):
+        markdown = markdown.strip()
+        if not markdown:
+            return []
+        if markdown.startswith(HEADING_PREFIX):
+            title = markdown.split('\n', 1)[0][len(HEADING_PREFIX):].strip()
+        else:
+            title = ''
+        return [(title, markdown)]
+
+
+def split_sections(markdown):
+    """Split a complete markdown analysis into (title, markdown) sections"""
+    sections = SectionStream()
+    return sections.feed(markdown or '') + sections.close()
+
+
+def _title(heading_line):
+    """Heading text without the '## ' marker or surrounding bold markers"""
+    return heading_line[len(HEADING_PREFIX):].strip().strip('*').strip()
+
+
+class SectionIndex:
+    """Ordered index of the '## ' sections of an analysis, built in one scan.
+
+    Maps each section title to the (start, end) span of its body in the
+    response text, so consumers look sections up by name instead of
+    splitting the whole response again. Text before the first heading is
+    not a section. When a title occurs twice the first one wins.
+    """
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.titles = []
+        self.spans = {}
+        starts = [match.start() for match in HEADING_RE.finditer(self.text)]
+        for start, end in zip(starts, starts[1:] + [len(self.text)]):
+            line_end = self.text.find('\n', start, end)
+            body_start = end if line_end == -1 else line_end + 1
+            title = _title(self.text[start:body_start])
+            if title not in self.spans:
+                self.titles.append(title)
+                self.spans[title] = (body_start, end)
+
+    def find(self, name):
+        """Return the title of the section called `name`, or starting with it, or None"""
+        if name in self.spans:
+            return name
+        for title in self.titles:
+            if title.startswith(name):
+                return title
+        return None
+
+    def get(self, name, default=''):
+        """Return the stripped body of a section, looked up as in find()"""
+        title = self.find(name)
+        if title is None:
+            return default
+        start, end = self.spans[title]
+        return self.text[start:end].strip()
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def sections(self):
+        """Return (title, stripped body) for every section in order"""
+        return [(title, self.get(title)) for title in self.titles]
+
+
+# Indexes of recently seen responses, keyed by their text
+_indexes = LRUCache(32)
+
+
+def get_section_index(analysis):
+    """Return the section index of an analysis result dict or its markdown text.
+
+    The index is built once per response text and kept in a small LRU, so
+    every consumer of the same response (score extraction, the app, the PDF
+    reports) shares one index without storing it on the result dict.
+    """
+    if isinstance(analysis, dict):
+        analysis = analysis.get("analysis") or analysis.get("full_response")
+    text = analysis or ''
+    index = _indexes.get(text)
+    if index is None:
+        index = SectionIndex(text)
+        _indexes.set(text, index)
+    return index
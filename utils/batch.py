@@ -0,0 +1,156 @@
+"""Headless batch ATS analysis of resume files.
+
+    python -m utils.batch <directory> --role "Data Scientist" [--workers N] [--output report.csv]
+
+Kept out of the utils package imports, so running it with -m does not load
+the module twice.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .extraction import extract_document
+from .resume_analyzer import ResumeAnalyzer
+from .skill_matcher import ROLE_CATEGORIES
+
+
+# Columns of the batch report, in CSV order
+BATCH_FIELDS = [
+    'file', 'role', 'document_type', 'ats_score', 'keyword_score', 'format_score', 'section_score',
+    'found_skills', 'missing_skills', 'extract_ms', 'analyze_ms', 'total_ms', 'error'
+]
+
+
+def iter_resume_files(directory):
+    """Yield the paths of all PDF and DOCX files below a directory, in a stable order"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(('.pdf', '.docx')):
+                yield os.path.join(root, name)
+
+
+def analyze_file(path, role, job_requirements):
+    """Extract and analyze one resume file and return a flat report row with timings"""
+    row = {field: '' for field in BATCH_FIELDS}
+    row.update(file=path, role=role)
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as file:
+            document = extract_document(file)
+        extracted = time.perf_counter()
+        row['extract_ms'] = round((extracted - start) * 1000, 1)
+        if document.error or not document.text:
+            row['error'] = document.error or "No text could be extracted"
+        else:
+            analysis = ResumeAnalyzer().analyze_resume(
+                {'raw_text': document.text, 'document': document.document}, job_requirements
+            )
+            row['analyze_ms'] = round((time.perf_counter() - extracted) * 1000, 1)
+            keyword_match = analysis.get('keyword_match', {})
+            row.update(
+                document_type=analysis.get('document_type', ''),
+                ats_score=analysis.get('ats_score', 0),
+                keyword_score=round(keyword_match.get('score', 0), 1),
+                format_score=analysis.get('format_score', 0),
+                section_score=analysis.get('section_score', 0),
+                found_skills=keyword_match.get('found_skills', []),
+                missing_skills=keyword_match.get('missing_skills', []),
+                error=analysis.get('error', '')
+            )
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return row
+
+
+class _ReportWriter:
+    """Writes report rows as JSON lines or CSV, flushing after every row"""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=BATCH_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == 'csv':
+            self._csv.writerow({
+                key: '; '.join(value) if isinstance(value, list) else value
+                for key, value in row.items()
+            })
+        else:
+            self.stream.write(json.dumps(row) + '\n')
+        self.stream.flush()
+
+
+def _init_batch_worker():
+    """Keep each batch worker to one extraction sandbox process and inline OCR.
+
+    The batch pool already runs one worker per core; letting every worker
+    start its own sandbox pool and a CPU-count OCR pool would oversubscribe
+    the machine several times over.
+    """
+    os.environ['EXTRACTION_WORKERS'] = '1'
+    os.environ['OCR_WORKERS'] = '1'
+
+
+def run_batch(directory, role, output=None, fmt=None, workers=None):
+    """Analyze every resume below a directory in a process pool, streaming rows as they finish.
+
+    Returns the number of files that failed.
+    """
+    if role not in ROLE_CATEGORIES:
+        raise ValueError(f"Unknown job role: {role}")
+    from config.job_roles import JOB_ROLES
+    job_requirements = JOB_ROLES[ROLE_CATEGORIES[role]][role]
+
+    paths = list(iter_resume_files(directory))
+    fmt = fmt or ('csv' if output and output.lower().endswith('.csv') else 'jsonl')
+    stream = open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+    writer = _ReportWriter(stream, fmt)
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_batch_worker) as pool:
+            futures = [pool.submit(analyze_file, path, role, job_requirements) for path in paths]
+            for future in as_completed(futures):
+                row = future.result()
+                failed += bool(row['error'])
+                writer.write(row)
+    finally:
+        if output:
+            stream.close()
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {len(paths)} file(s) in {elapsed:.1f}s ({failed} failed)", file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.batch',
+        description="Headless ATS analysis of every PDF/DOCX file below a directory"
+    )
+    parser.add_argument('directory', help="Directory to scan recursively")
+    parser.add_argument('--role', required=True, help="Job role from config/job_roles.py, e.g. \"Data Scientist\"")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', help="Report file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Report format (default: from --output extension, else jsonl)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+    if args.role not in ROLE_CATEGORIES:
+        parser.error(f"unknown role {args.role!r}; choose from: {', '.join(sorted(ROLE_CATEGORIES))}")
+    failed = run_batch(args.directory, args.role, args.output, args.format, args.workers)
+    # Nonzero when any file failed, so scripts and CI can tell
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
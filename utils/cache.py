@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Directory used for all on-disk caches (extraction, rasters, LLM responses)
+CACHE_DIR = os.getenv("RESUMAI_CACHE_DIR", ".cache")
+
+
+def cache_path(filename):
+    """Return the path of a file inside the cache directory, creating it if needed"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache bounded by number of entries"""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class DiskCache:
+    """SQLite-backed key/value cache with size-based LRU eviction and optional TTL.
+
+    Values are stored as text or bytes. Any database error is reported and
+    treated as a cache miss so callers never fail because of the cache.
+    """
+
+    def __init__(self, db_path, max_bytes=256 * 1024 * 1024, ttl=None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)')
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error initializing cache at {self.db_path}: {e}")
+
+    def get(self, key):
+        """Return the cached value or None on a miss"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        'SELECT value, created_at FROM cache WHERE key = ?', (key,)
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    value, created_at = row
+                    if self.ttl is not None and now - created_at > self.ttl:
+                        conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                        conn.commit()
+                        return None
+                    conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+                    conn.commit()
+                    return value
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading from cache: {e}")
+            return None
+
+    def set(self, key, value):
+        """Store a value and evict least recently used entries beyond max_bytes"""
+        size = len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (key, value, size, now, now)
+                    )
+                    self._evict(conn)
+                    conn.commit()
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error writing to cache: {e}")
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute('SELECT key, size FROM cache ORDER BY accessed_at ASC').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            total -= size
+
+    def usage(self):
+        """Return (entries, bytes) currently stored, or (0, 0) if the database is unreadable"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    return conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading cache usage: {e}")
+            return 0, 0
+
+    def delete(self, key):
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                    conn.commit()
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error deleting from cache: {e}")
+
+    def clear(self):
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute('DELETE FROM cache')
+                    conn.commit()
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error clearing cache: {e}")
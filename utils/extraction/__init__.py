@@ -0,0 +1,10 @@
+"""
+Document text extraction for Resum.AI
+"""
+
+from .cache import ExtractionCache, get_extraction_cache, document_hash, EXTRACTOR_VERSION
+from .document import ResumeDocument, DocumentLine, as_document
+from .pipeline import ExtractionBudget, ExtractionResult, PageText, extract_document
+from .ocr import OCRConfig, ocr_pages
+from .sandbox import ExtractionSandbox, get_sandbox
+from .raster_cache import RasterCache, get_raster_cache
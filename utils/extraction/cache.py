@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+
+from ..cache import LRUCache, DiskCache, cache_path
+
+# Bump whenever extraction output changes so stale cached text is ignored
+EXTRACTOR_VERSION = "4"
+
+
+def document_hash(data):
+    """Return the SHA-256 hex digest of the raw upload bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier cache for extracted document text.
+
+    Entries are keyed by the SHA-256 of the upload, the extractor name and
+    EXTRACTOR_VERSION. Lookups hit an in-memory LRU first and fall back to an
+    SQLite file with size-based eviction, so expensive results (OCR in
+    particular) survive reruns and restarts.
+    """
+
+    def __init__(self, memory_entries=64, db_path=None, max_bytes=None):
+        if db_path is None:
+            db_path = cache_path("extraction.db")
+        if max_bytes is None:
+            max_bytes = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "256")) * 1024 * 1024
+        self.memory = LRUCache(max_entries=memory_entries)
+        self.disk = DiskCache(db_path, max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(digest, extractor):
+        return f"{digest}:{extractor}:{EXTRACTOR_VERSION}"
+
+    def get(self, digest, extractor):
+        """Return the cached payload dict or None"""
+        key = self.make_key(digest, extractor)
+        payload = self.memory.get(key)
+        if payload is not None:
+            return payload
+
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            self.disk.delete(key)
+            return None
+        self.memory.set(key, payload)
+        return payload
+
+    def set(self, digest, extractor, payload):
+        key = self.make_key(digest, extractor)
+        self.memory.set(key, payload)
+        self.disk.set(key, json.dumps(payload))
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+
+_extraction_cache = None
+
+
+def get_extraction_cache():
+    """Return the process-wide extraction cache"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
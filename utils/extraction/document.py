@@ -0,0 +1,134 @@
+from bisect import bisect_right
+from collections import Counter
+
+# A line counts as a heading when its font is this much larger than body text
+HEADING_SIZE_RATIO = 1.15
+HEADING_MAX_WORDS = 8
+
+
+class DocumentLine:
+    """One line of a document with its position and layout hints"""
+
+    __slots__ = ('index', 'text', 'lower', 'start', 'page', 'size', 'heading')
+
+    def __init__(self, index, text, start, page=1, size=None):
+        self.index = index
+        self.text = text.strip()
+        self.lower = self.text.lower()
+        self.start = start
+        self.page = page
+        self.size = size
+        self.heading = False
+
+    def __repr__(self):
+        return f"DocumentLine({self.index}, {self.text!r}, page={self.page}, heading={self.heading})"
+
+
+class ResumeDocument:
+    """Line-structured view of an extracted document, computed once.
+
+    Holds the joined text and its lowercase form, every line (stripped and
+    lowercased) with its character offset into `text`, the page it came from
+    and, for PDFs with a text layer, its font size. Lines set in a larger
+    font than the body text, or in all caps, are flagged as headings.
+    Analyzers read from this instead of re-splitting and re-lowercasing the
+    raw string at every stage.
+    """
+
+    def __init__(self, raw_lines):
+        """raw_lines is an iterable of (text, page, size) tuples in reading order"""
+        raw_lines = list(raw_lines)
+        # Match ExtractionResult.text, which strips blank lines at either end
+        while raw_lines and not raw_lines[0][0].strip():
+            raw_lines.pop(0)
+        while raw_lines and not raw_lines[-1][0].strip():
+            raw_lines.pop()
+
+        self.lines = []
+        offset = 0
+        for index, (text, page, size) in enumerate(raw_lines):
+            self.lines.append(DocumentLine(index, text, offset, page, size))
+            offset += len(text) + 1
+
+        self.text = '\n'.join(text for text, _, _ in raw_lines)
+        self.lower = self.text.lower()
+        self._starts = [line.start for line in self.lines]
+        self.body_size = self._body_font_size()
+        self._flag_headings()
+
+    @classmethod
+    def from_text(cls, text):
+        """Build a document from plain text (no page or font information)"""
+        return cls((line, 1, None) for line in (text or '').split('\n'))
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Build a document from PageText objects, keeping page numbers and font sizes"""
+        def raw_lines():
+            for page in pages:
+                sizes = getattr(page, 'sizes', None) or ()
+                for i, line in enumerate(page.text.split('\n')):
+                    yield line, page.number, sizes[i] if i < len(sizes) else None
+        return cls(raw_lines())
+
+    def _body_font_size(self):
+        """Most common font size weighted by characters, or None without font data"""
+        weights = Counter()
+        for line in self.lines:
+            if line.size:
+                weights[line.size] += len(line.text)
+        return weights.most_common(1)[0][0] if weights else None
+
+    def _flag_headings(self):
+        threshold = self.body_size * HEADING_SIZE_RATIO if self.body_size else None
+        for line in self.lines:
+            if not line.text:
+                continue
+            if line.text.isupper():
+                line.heading = True
+            elif threshold and line.size and line.size >= threshold:
+                line.heading = len(line.text.split()) <= HEADING_MAX_WORDS
+
+    @property
+    def non_empty_lines(self):
+        return [line for line in self.lines if line.text]
+
+    @property
+    def headings(self):
+        return [line for line in self.lines if line.heading]
+
+    @property
+    def page_count(self):
+        return self.lines[-1].page if self.lines else 0
+
+    def line_at(self, offset):
+        """Return the line containing the character offset into `text`"""
+        if not self.lines:
+            return None
+        return self.lines[max(0, bisect_right(self._starts, offset) - 1)]
+
+    def title_line(self, search_lines=5):
+        """Best guess at the candidate's name line.
+
+        The name is usually the largest text near the top of the first page;
+        without font data the first non-empty line is used.
+        """
+        candidates = []
+        for line in self.lines:
+            if line.text:
+                candidates.append(line)
+                if len(candidates) >= search_lines:
+                    break
+        if not candidates:
+            return None
+        sized = [line for line in candidates if line.size and line.page == candidates[0].page]
+        if sized and self.body_size and max(line.size for line in sized) > self.body_size:
+            return max(sized, key=lambda line: line.size)
+        return candidates[0]
+
+
+def as_document(text):
+    """Accept either raw text or a ResumeDocument and return a ResumeDocument"""
+    if isinstance(text, ResumeDocument):
+        return text
+    return ResumeDocument.from_text(text)
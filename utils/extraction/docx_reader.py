@@ -0,0 +1,146 @@
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+P = W_NS + 'p'
+T = W_NS + 't'
+TAB = W_NS + 'tab'
+BR = W_NS + 'br'
+CR = W_NS + 'cr'
+TR = W_NS + 'tr'
+TC = W_NS + 'tc'
+FALLBACK = MC_NS + 'Fallback'
+
+_HEADER_RE = re.compile(r'^word/header\d*\.xml$')
+_FOOTER_RE = re.compile(r'^word/footer\d*\.xml$')
+
+
+def _part_sort_key(name):
+    digits = re.findall(r'\d+', name)
+    return int(digits[-1]) if digits else 0
+
+
+def docx_parts(names):
+    """Return the XML parts to read, in reading order: headers, body, footers"""
+    headers = sorted((n for n in names if _HEADER_RE.match(n)), key=_part_sort_key)
+    footers = sorted((n for n in names if _FOOTER_RE.match(n)), key=_part_sort_key)
+    return headers + ['word/document.xml'] + footers
+
+
+def iter_part_lines(stream):
+    """Stream one WordprocessingML part and yield its text lines in order.
+
+    Paragraphs become lines, table rows become "cell | cell" lines and text
+    box paragraphs are emitted after the paragraph that anchors them.
+    mc:Fallback content is skipped because it duplicates mc:Choice.
+    """
+    paragraphs = []   # Stack of run buffers for (possibly nested) paragraphs
+    cells = []        # Stack of paragraph lists for open table cells
+    rows = []         # Stack of cell lists for open table rows
+    deferred = []     # Text box lines waiting for their anchor paragraph
+    skip_depth = 0
+
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+
+        if tag == FALLBACK:
+            skip_depth += 1 if event == 'start' else -1
+            if event == 'end':
+                elem.clear()
+            continue
+        if skip_depth:
+            continue
+
+        if event == 'start':
+            if tag == P:
+                paragraphs.append([])
+            elif tag == TC:
+                cells.append([])
+            elif tag == TR:
+                rows.append([])
+            continue
+
+        # End events
+        if tag == T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == TAB:
+            if paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in (BR, CR):
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == P:
+            text = ''.join(paragraphs.pop()).strip()
+            elem.clear()
+            if paragraphs:
+                # Paragraph inside a text box anchored in another paragraph
+                if text:
+                    deferred.append(text)
+            elif cells:
+                if text:
+                    cells[-1].append(text)
+                cells[-1].extend(deferred)
+                deferred = []
+            else:
+                yield text
+                yield from deferred
+                deferred = []
+        elif tag == TC:
+            cell_text = ' '.join(cells.pop())
+            if rows:
+                rows[-1].append(cell_text)
+            elem.clear()
+        elif tag == TR:
+            row_text = ' | '.join(cell for cell in rows.pop() if cell)
+            elem.clear()
+            if cells:
+                # Nested table: the row belongs to the enclosing cell
+                if row_text:
+                    cells[-1].append(row_text)
+            elif row_text:
+                yield row_text
+
+
+def iter_docx_lines(source):
+    """Yield text lines from a DOCX file without building a document model"""
+    with zipfile.ZipFile(source) as archive:
+        names = set(archive.namelist())
+        if 'word/document.xml' not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing")
+        seen = set()
+        for part in docx_parts(names):
+            is_body = part == 'word/document.xml'
+            with archive.open(part) as stream:
+                for line in iter_part_lines(stream):
+                    if not is_body and line:
+                        # First-page/even-page headers usually repeat the default one
+                        if line in seen:
+                            continue
+                        seen.add(line)
+                    yield line
+
+
+def read_docx_text(source, max_chars=None):
+    """Return (text, truncated) for a DOCX file, stopping at max_chars.
+
+    truncated is only set when content is left after the cut, so a document
+    that ends exactly at the budget is returned whole and unflagged.
+    """
+    lines = []
+    chars = -1  # Length of the joined text; the first line adds no separator
+    truncated = False
+    line_iter = iter_docx_lines(source)
+    try:
+        for line in line_iter:
+            lines.append(line)
+            chars += len(line) + 1
+            if max_chars is not None and chars >= max_chars:
+                truncated = chars > max_chars or any(rest.strip() for rest in line_iter)
+                break
+    finally:
+        line_iter.close()
+    return '\n'.join(lines), truncated
@@ -0,0 +1,126 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Common Poppler install locations on Windows
+WINDOWS_POPPLER_PATHS = [
+    r'C:\poppler\Library\bin',
+    r'C:\Program Files\poppler\bin',
+    r'C:\Program Files (x86)\poppler\bin',
+    r'C:\poppler\bin'
+]
+
+
+def find_poppler_path():
+    """Return the Poppler bin directory on Windows, or None to use PATH"""
+    if os.name != 'nt':
+        return None
+    for path in WINDOWS_POPPLER_PATHS:
+        if os.path.exists(path):
+            return path
+    return WINDOWS_POPPLER_PATHS[0]
+
+
+class OCRConfig:
+    """OCR settings, read from the environment unless given explicitly"""
+
+    def __init__(self, dpi=None, grayscale=None, workers=None):
+        if dpi is None:
+            dpi = int(os.getenv("OCR_DPI", "300"))
+        if grayscale is None:
+            grayscale = os.getenv("OCR_GRAYSCALE", "true").lower() in ("1", "true", "yes")
+        if workers is None:
+            workers = int(os.getenv("OCR_WORKERS", "0")) or os.cpu_count() or 1
+        self.dpi = dpi
+        self.grayscale = grayscale
+        self.workers = max(1, workers)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Return the shared OCR process pool, bounded to `workers` processes"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def _forget_pool_after_fork():
+    """A forked child must not reuse the parent's pool or a held lock"""
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_pool_after_fork)
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _ocr_image(image_path):
+    """OCR one rendered page image. Runs inside a pool worker."""
+    import pytesseract
+
+    # pytesseract hands file paths straight to tesseract without loading them
+    return pytesseract.image_to_string(image_path)
+
+
+def ocr_pages(pdf_path, page_numbers, config=None, digest=None, raster_cache=None):
+    """Run OCR on the given 1-based page numbers of the PDF at pdf_path.
+
+    Only the requested pages are rasterized, and rendered pages are reused
+    from the raster cache keyed by (digest, page, DPI). A single page is
+    processed inline; several pages are fanned out across the shared process
+    pool. Returns a dict mapping page number to recognized text. Raises
+    ImportError if pytesseract/pdf2image are missing so callers can report it.
+    """
+    # Fail fast in the calling process when the OCR stack is not installed
+    import pytesseract  # noqa: F401
+    import pdf2image  # noqa: F401
+
+    from .cache import document_hash
+    from .raster_cache import get_raster_cache
+
+    config = config or OCRConfig()
+    page_numbers = list(page_numbers)
+    if digest is None:
+        with open(pdf_path, 'rb') as pdf_file:
+            digest = document_hash(pdf_file.read())
+    raster_cache = raster_cache or get_raster_cache()
+
+    image_paths = raster_cache.render(
+        pdf_path,
+        digest,
+        page_numbers,
+        config.dpi,
+        config.grayscale,
+        thread_count=config.workers,
+        poppler_path=find_poppler_path()
+    )
+
+    if len(page_numbers) == 1 or config.workers == 1:
+        return {page_number: _ocr_image(image_paths[page_number]) for page_number in page_numbers}
+
+    pool = _get_pool(config.workers)
+    try:
+        futures = {
+            page_number: pool.submit(_ocr_image, image_paths[page_number])
+            for page_number in page_numbers
+        }
+        return {page_number: future.result() for page_number, future in futures.items()}
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OOM killer); start fresh next time
+        _reset_pool()
+        raise
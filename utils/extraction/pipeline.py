@@ -0,0 +1,362 @@
+import os
+import warnings
+
+from .cache import get_extraction_cache, document_hash
+from .ocr import ocr_pages, OCRConfig
+from .source import read_upload, BufferReader, spill_to_file
+from .sandbox import get_sandbox
+from .docx_reader import read_docx_text
+from .document import ResumeDocument
+from ..timings import StageTimer
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class ExtractionBudget:
+    """Upper bounds on how much work a single upload may cause"""
+
+    def __init__(self, max_pages=None, max_chars=None):
+        if max_pages is None:
+            max_pages = int(os.getenv("EXTRACTION_MAX_PAGES", "20"))
+        if max_chars is None:
+            max_chars = int(os.getenv("EXTRACTION_MAX_CHARS", "100000"))
+        self.max_pages = max(1, max_pages)
+        self.max_chars = max(1, max_chars)
+
+    def clip(self, pages):
+        """Trim page texts in place to max_chars. Returns True if anything was cut."""
+        remaining = self.max_chars
+        clipped = False
+        for page in pages:
+            if len(page.text) > remaining:
+                page.text = page.text[:remaining]
+                clipped = True
+            remaining -= len(page.text)
+        return clipped
+
+
+class PageText:
+    """Text of a single page together with the backend that produced it.
+
+    `sizes` holds the font size of each text line when the backend knows it.
+    `truncated` is set when the backend itself stopped reading at the
+    character budget; it is reported on the ExtractionResult, not stored
+    per page.
+    """
+
+    __slots__ = ('number', 'text', 'backend', 'sizes', 'truncated')
+
+    def __init__(self, number, text, backend, sizes=None, truncated=False):
+        self.number = number
+        self.text = text
+        self.backend = backend
+        self.sizes = sizes
+        self.truncated = truncated
+
+    def to_dict(self):
+        return {'number': self.number, 'text': self.text, 'backend': self.backend, 'sizes': self.sizes}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['number'], data['text'], data['backend'], data.get('sizes'))
+
+
+class ExtractionResult:
+    """Outcome of extracting a document, shared by all analyzers"""
+
+    def __init__(self, pages=None, kind=None, digest=None, warnings=None, error=None, truncated=False):
+        self.pages = pages or []
+        self.kind = kind
+        self.digest = digest
+        self.warnings = warnings or []
+        self.error = error
+        self.truncated = truncated
+        self.text = '\n'.join(page.text for page in self.pages).strip()
+        self._document = None
+
+    @property
+    def document(self):
+        """Line-structured ResumeDocument, built on first access and kept"""
+        if self._document is None:
+            self._document = ResumeDocument.from_pages(self.pages)
+        return self._document
+
+    @property
+    def ok(self):
+        return self.error is None and bool(self.text)
+
+    @property
+    def backends(self):
+        """Set of backends used across pages"""
+        return {page.backend for page in self.pages}
+
+    def to_dict(self):
+        return {
+            'pages': [page.to_dict() for page in self.pages],
+            'kind': self.kind,
+            'digest': self.digest,
+            'warnings': self.warnings,
+            'error': self.error,
+            'truncated': self.truncated
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            pages=[PageText.from_dict(page) for page in data.get('pages', [])],
+            kind=data.get('kind'),
+            digest=data.get('digest'),
+            warnings=data.get('warnings', []),
+            error=data.get('error'),
+            truncated=data.get('truncated', False)
+        )
+
+    @classmethod
+    def failed(cls, error, kind=None, digest=None):
+        return cls(kind=kind, digest=digest, error=error)
+
+
+def detect_kind(data, file=None, kind=None):
+    """Work out whether an upload is a PDF or a DOCX"""
+    if kind:
+        return kind
+    mime = getattr(file, 'type', None)
+    if mime == PDF_MIME:
+        return 'pdf'
+    if mime == DOCX_MIME:
+        return 'docx'
+    name = getattr(file, 'name', '') or ''
+    if name.lower().endswith('.pdf'):
+        return 'pdf'
+    if name.lower().endswith('.docx'):
+        return 'docx'
+    if bytes(data[:4]) == b'%PDF':
+        return 'pdf'
+    if bytes(data[:2]) == b'PK':
+        return 'docx'
+    return None
+
+
+def _has_text_layer(page):
+    """Cheap probe: a page has a usable text layer if it contains any chars.
+
+    pdfplumber caches the parsed layout, so the probe is reused by the
+    subsequent extract_text() call instead of parsing the page twice.
+    """
+    return bool(page.chars)
+
+
+def _text_with_sizes(page):
+    """Return (text, per-line font sizes) for a pdfplumber page.
+
+    extract_text_lines() uses the same line clustering as extract_text(), so
+    joining its lines gives the same text while keeping each line's chars.
+    """
+    if not hasattr(page, 'extract_text_lines'):  # pdfplumber < 0.10
+        return page.extract_text() or '', None
+    lines = page.extract_text_lines()
+    sizes = [
+        round(max(char['size'] for char in line['chars']), 1) if line.get('chars') else None
+        for line in lines
+    ]
+    return '\n'.join(line['text'] for line in lines), sizes
+
+
+def iter_pdf_pages(data, warning_messages):
+    """Yield the pages of a PDF lazily, opening the document only once.
+
+    Pages without a usable text layer are yielded with backend 'ocr' and
+    empty text so they can be OCR'd afterwards. Closing the generator early
+    closes the document.
+    """
+    try:
+        import pdfplumber
+    except ImportError:
+        yield from iter_pdf_pages_pypdf2(data, warning_messages)
+        return
+
+    try:
+        pdf = pdfplumber.open(BufferReader(data))
+    except Exception as e:
+        # Only fall back to a second parser when pdfplumber cannot read the file at all
+        warning_messages.append(f"pdfplumber could not open the PDF: {e}")
+        yield from iter_pdf_pages_pypdf2(data, warning_messages)
+        return
+
+    with pdf:
+        for number, page in enumerate(pdf.pages, start=1):
+            page_text = ''
+            sizes = None
+            backend = 'ocr'
+            try:
+                # Suppress specific warnings about PDFColorSpace conversion
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+                    warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+                    if _has_text_layer(page):
+                        page_text, sizes = _text_with_sizes(page)
+                        backend = 'pdfplumber'
+            except Exception as e:
+                if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
+                    warning_messages.append(f"Error extracting text from page {number}: {e}")
+            finally:
+                # Drop the parsed layout so memory stays flat on long documents
+                page.close()
+            if not page_text.strip():
+                backend = 'ocr'
+                sizes = None
+            yield PageText(number, page_text, backend, sizes)
+
+
+def iter_pdf_pages_pypdf2(data, warning_messages):
+    """Fallback text-layer extraction with PyPDF2"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(BufferReader(data))
+    for number, page in enumerate(pdf_reader.pages, start=1):
+        try:
+            page_text = page.extract_text() or ''
+        except Exception as e:
+            warning_messages.append(f"Error extracting text from page {number}: {e}")
+            page_text = ''
+        yield PageText(number, page_text, 'pypdf2' if page_text.strip() else 'ocr')
+
+
+def _apply_ocr(data, pages, warning_messages, ocr_config=None, digest=None):
+    """OCR only the pages that had no usable text layer"""
+    missing = [page.number for page in pages if page.backend == 'ocr']
+    if not missing:
+        return
+    try:
+        # Poppler only reads from a path, so spill the buffer just for OCR
+        with spill_to_file(data, suffix='.pdf') as pdf_path:
+            texts = ocr_pages(pdf_path, missing, ocr_config, digest=digest or document_hash(data))
+    except ImportError as e:
+        warning_messages.append(f"OCR libraries not available: {e}")
+        return
+    except Exception as e:
+        warning_messages.append(f"OCR processing failed: {e}")
+        return
+    for page in pages:
+        if page.number in texts:
+            page.text = texts[page.number]
+
+
+def iter_docx_pages(data, warning_messages, max_chars=None):
+    """Yield the text of a DOCX file (headers, body, tables, text boxes) as a single page"""
+    text, truncated = read_docx_text(BufferReader(data), max_chars)
+    yield PageText(1, text, 'docx-xml', truncated=truncated)
+
+
+def _collect_pages(page_iter, budget, warning_messages, kind='pdf'):
+    """Consume pages until the page or character budget is exhausted.
+
+    The document only counts as truncated when something is left after the
+    cut: text past max_chars, or a further page once a budget is used up.
+    """
+    pages = []
+    chars = 0
+    truncated = False
+    try:
+        for page in page_iter:
+            if len(pages) >= budget.max_pages or chars >= budget.max_chars:
+                truncated = True
+                break
+            pages.append(page)
+            chars += len(page.text)
+            if chars > budget.max_chars or page.truncated:
+                truncated = True
+                break
+    finally:
+        # Stop the backend immediately instead of parsing the rest of the file
+        page_iter.close()
+
+    if truncated:
+        if kind == 'pdf':
+            warning_messages.append(
+                f"Document exceeds the extraction budget ({budget.max_pages} pages / "
+                f"{budget.max_chars} characters); only the first {len(pages)} page(s) were processed."
+            )
+        else:
+            warning_messages.append(
+                f"Document exceeds the extraction budget ({budget.max_chars} characters); "
+                f"only the first {budget.max_chars} characters were processed."
+            )
+    return pages, truncated
+
+
+def extract_pages(data, kind, budget=None, ocr_config=None, digest=None):
+    """Run the extraction backends on an in-memory document.
+
+    This is the unit of work executed inside sandbox workers; it does not
+    touch the cache.
+    """
+    budget = budget or ExtractionBudget()
+    warning_messages = []
+    try:
+        if kind == 'pdf':
+            page_iter = iter_pdf_pages(data, warning_messages)
+        else:
+            page_iter = iter_docx_pages(data, warning_messages, budget.max_chars)
+        pages, truncated = _collect_pages(page_iter, budget, warning_messages, kind)
+        if kind == 'pdf':
+            _apply_ocr(data, pages, warning_messages, ocr_config, digest)
+        truncated = budget.clip(pages) or truncated
+    except MemoryError:
+        raise
+    except Exception as e:
+        return ExtractionResult.failed(f"Error extracting text from {kind.upper()}: {e}", kind)
+    return ExtractionResult(pages, kind, warnings=warning_messages, truncated=truncated)
+
+
+def extract_document(file, kind=None, use_cache=True, ocr_config=None, budget=None, sandbox=None):
+    """Extract text from a PDF or DOCX upload in a single pass.
+
+    The upload is read once (as a memoryview when the upload supports
+    getbuffer()), hashed, and looked up in the extraction cache. On a miss
+    the document is opened once straight from memory and each page is routed
+    to the text-layer backend or to OCR depending on a text-layer probe.
+    Pages are streamed lazily and extraction stops as soon as the page or
+    character budget is used up; the text is joined once at the end.
+
+    Unless disabled with EXTRACTION_SANDBOX=false, the backends run in a
+    sandboxed worker process with a timeout and memory cap; failures come
+    back as a result whose error reads "extraction failed: <reason>".
+    Stage durations are recorded in the timing registry under "extraction".
+    """
+    timer = StageTimer('extraction')
+    try:
+        data = read_upload(file)
+    except Exception as e:
+        return ExtractionResult.failed(f"Could not read upload: {e}")
+
+    kind = detect_kind(data, file, kind)
+    if kind not in ('pdf', 'docx'):
+        return ExtractionResult.failed("Unsupported file type. Please upload a PDF or DOCX file.")
+
+    budget = budget or ExtractionBudget()
+    cache_name = f"pipeline:{budget.max_pages}:{budget.max_chars}"
+    cache = get_extraction_cache() if use_cache else None
+    with timer.stage('cache_lookup'):
+        digest = document_hash(data)
+        cached = cache.get(digest, cache_name) if cache is not None else None
+    if cached is not None:
+        result = ExtractionResult.from_dict(cached)
+        timer.finish()
+        return result
+
+    if sandbox is None:
+        sandbox = get_sandbox()
+    with timer.stage('pages'):
+        if sandbox is not None:
+            result = sandbox.run(data, kind, budget, ocr_config, digest)
+        else:
+            result = extract_pages(data, kind, budget, ocr_config, digest)
+    result.digest = digest
+
+    # Failed and empty results are not cached so a missing OCR install can be fixed and retried
+    if result.ok and cache is not None:
+        cache.set(digest, cache_name, result.to_dict())
+    timer.finish()
+    return result
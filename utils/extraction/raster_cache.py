@@ -0,0 +1,140 @@
+import os
+import re
+import tempfile
+import threading
+
+from ..cache import cache_path
+
+# Bump when the rendered images change, so stale files are never looked up again
+# (2: version 1 could store images under the wrong page number)
+RASTER_CACHE_VERSION = "2"
+
+# pdftoppm names its output "<prefix>-<page>.<ext>", the page zero-padded
+_PAGE_SUFFIX_RE = re.compile(r'-(\d+)\.\w+$')
+
+
+def _runs(numbers):
+    """Group sorted page numbers into contiguous (first, last) runs"""
+    runs = []
+    for number in sorted(numbers):
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return [tuple(run) for run in runs]
+
+
+def _rendered_page_number(path):
+    """Page number pdftoppm wrote into an output filename, or None"""
+    match = _PAGE_SUFFIX_RE.search(os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+
+class RasterCache:
+    """On-disk cache of rasterized PDF pages keyed by (document hash, page, DPI).
+
+    Pages are rendered with pdf2image's output_folder/paths_only mode so
+    they go straight to disk and are handed to OCR as file paths; no PIL
+    images are kept in memory. The directory is trimmed to max_bytes by
+    evicting the least recently used files.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        if directory is None:
+            directory = cache_path("rasters")
+        if max_bytes is None:
+            max_bytes = int(os.getenv("RASTER_CACHE_MAX_MB", "512")) * 1024 * 1024
+        # Absolute, so rendering never depends on (or writes to) the working directory
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_for(self, digest, page_number, dpi, grayscale):
+        suffix = '-gray' if grayscale else ''
+        return os.path.join(self.directory, f"{digest}-v{RASTER_CACHE_VERSION}-p{page_number}-{dpi}dpi{suffix}.png")
+
+    def get(self, digest, page_number, dpi, grayscale):
+        """Return the cached page image path, or None"""
+        path = self.path_for(digest, page_number, dpi, grayscale)
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def render(self, pdf_path, digest, page_numbers, dpi, grayscale, thread_count=1, poppler_path=None):
+        """Return {page number: image path}, rendering only pages not yet cached"""
+        from pdf2image import convert_from_path
+
+        paths = {}
+        missing = []
+        for page_number in page_numbers:
+            cached = self.get(digest, page_number, dpi, grayscale)
+            if cached:
+                paths[page_number] = cached
+            else:
+                missing.append(page_number)
+
+        for first, last in _runs(missing):
+            with tempfile.TemporaryDirectory(dir=self.directory) as output_folder:
+                rendered = convert_from_path(
+                    pdf_path,
+                    dpi=dpi,
+                    first_page=first,
+                    last_page=last,
+                    grayscale=grayscale,
+                    fmt='png',
+                    output_folder=output_folder,
+                    paths_only=True,
+                    thread_count=min(thread_count, last - first + 1),
+                    poppler_path=poppler_path
+                )
+                # Each poppler thread writes under its own random prefix, so the file names
+                # do not sort in page order; take the page from the "-<page>" suffix and fall
+                # back to the returned order, which pdf2image keeps in page order
+                for position, rendered_path in enumerate(rendered):
+                    page_number = _rendered_page_number(rendered_path)
+                    if page_number is None or not first <= page_number <= last:
+                        page_number = first + position
+                    final_path = self.path_for(digest, page_number, dpi, grayscale)
+                    os.replace(rendered_path, final_path)
+                    paths[page_number] = final_path
+
+        if missing:
+            self.evict(keep=set(paths.values()))
+        return paths
+
+    def evict(self, keep=()):
+        """Delete least recently used images until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.is_file() or not entry.name.endswith('.png'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+_raster_cache = None
+
+
+def get_raster_cache():
+    """Return the process-wide raster cache"""
+    global _raster_cache
+    if _raster_cache is None:
+        _raster_cache = RasterCache()
+    return _raster_cache
@@ -0,0 +1,214 @@
+import atexit
+import multiprocessing
+import multiprocessing.util
+import os
+import queue
+import signal
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+FAILED_TIMEOUT = "extraction failed: timeout"
+FAILED_MEMORY = "extraction failed: memory limit exceeded"
+FAILED_CRASH = "extraction failed: worker crashed"
+FAILED_BUSY = "extraction failed: all workers busy"
+
+
+def _address_space_bytes():
+    """Current virtual memory size of this process, or 0 where it cannot be read"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def _apply_memory_limit(memory_limit_mb):
+    """Cap the worker's address space so a runaway parse cannot starve the server.
+
+    A forked worker inherits the whole address space of the server (thread
+    stacks, malloc arenas, loaded libraries), which can already exceed any
+    fixed cap. The limit is therefore the worker's size at startup plus a
+    budget of memory_limit_mb for the extraction itself.
+    """
+    if resource is None or not memory_limit_mb:
+        return
+    limit = _address_space_bytes() + memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Could not apply extraction memory limit: {e}")
+
+
+def _worker_main(conn, memory_limit_mb):
+    """Entry point of a sandbox worker: extract documents sent over the pipe"""
+    if hasattr(os, 'setsid'):
+        # Lead a new process group so OCR subprocesses die with the worker
+        os.setsid()
+    _apply_memory_limit(memory_limit_mb)
+
+    from .pipeline import extract_pages, ExtractionResult
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+
+        kind, budget, ocr_config, digest = job
+        data = None
+        try:
+            data = conn.recv_bytes()
+            result = extract_pages(data, kind, budget, ocr_config, digest)
+            conn.send((result.to_dict(), False))
+        except MemoryError:
+            # The interpreter state is suspect after a MemoryError; ask to be replaced
+            data = None
+            conn.send((ExtractionResult.failed(FAILED_MEMORY, kind).to_dict(), True))
+            break
+        finally:
+            data = None
+
+
+class SandboxWorker:
+    """Handle on a single worker process and its end of the pipe"""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class ExtractionSandbox:
+    """Pool of pre-forked worker processes that run document extraction.
+
+    Each job gets a wall-clock timeout and each worker runs under an
+    RLIMIT_AS memory cap of its startup size plus memory_limit_mb. Workers that time out, crash or exhaust their
+    memory are killed and replaced, and the caller receives a failed
+    ExtractionResult instead of an exception.
+    """
+
+    def __init__(self, workers=None, timeout=None, memory_limit_mb=None):
+        if workers is None:
+            workers = int(os.getenv("EXTRACTION_WORKERS", "2"))
+        if timeout is None:
+            timeout = float(os.getenv("EXTRACTION_TIMEOUT", "120"))
+        if memory_limit_mb is None:
+            memory_limit_mb = int(os.getenv("EXTRACTION_MEMORY_MB", "2048"))
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+
+        # Fork is cheap and keeps imports warm; other platforms need spawn
+        method = 'fork' if sys.platform.startswith('linux') else 'spawn'
+        self._ctx = multiprocessing.get_context(method)
+        self._idle = queue.Queue()
+        self._all = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb),
+            name="resumai-extraction-worker"
+        )
+        process.start()
+        child_conn.close()
+        worker = SandboxWorker(process, parent_conn)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _kill(self, worker):
+        process = worker.process
+        if process.is_alive():
+            try:
+                if hasattr(os, 'killpg'):
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except OSError:
+                process.kill()
+        process.join(timeout=5)
+        worker.conn.close()
+        with self._lock:
+            self._all.discard(worker)
+
+    def _recycle(self, worker):
+        self._kill(worker)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def run(self, data, kind, budget, ocr_config=None, digest=None):
+        """Extract a document in a worker and return an ExtractionResult"""
+        from .pipeline import ExtractionResult
+
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            return ExtractionResult.failed(FAILED_BUSY, kind)
+
+        if not worker.process.is_alive():
+            self._kill(worker)
+            worker = self._spawn()
+
+        try:
+            worker.conn.send((kind, budget, ocr_config, digest))
+            worker.conn.send_bytes(data)
+            if not worker.conn.poll(self.timeout):
+                self._recycle(worker)
+                return ExtractionResult.failed(FAILED_TIMEOUT, kind)
+            payload, recycle = worker.conn.recv()
+        except (EOFError, OSError):
+            self._recycle(worker)
+            return ExtractionResult.failed(FAILED_CRASH, kind)
+
+        if recycle:
+            self._recycle(worker)
+        else:
+            self._idle.put(worker)
+        return ExtractionResult.from_dict(payload)
+
+    def shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            workers = list(self._all)
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=1)
+            self._kill(worker)
+
+
+_sandbox = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox():
+    """Return the process-wide sandbox, or None when sandboxing is disabled"""
+    global _sandbox
+    if os.getenv("EXTRACTION_SANDBOX", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = ExtractionSandbox()
+            atexit.register(_sandbox.shutdown)
+            # Processes started by multiprocessing skip atexit and join their
+            # non-daemon children on exit, so they need a finalizer as well
+            multiprocessing.util.Finalize(None, _sandbox.shutdown, exitpriority=10)
+        return _sandbox
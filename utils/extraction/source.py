@@ -0,0 +1,116 @@
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def _default_spill_dir():
+    """Prefer a RAM-backed tmpfs so spill files never touch the disk"""
+    configured = os.getenv("EXTRACTION_SPILL_DIR")
+    if configured:
+        return configured
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None  # Fall back to the platform temp directory
+
+
+SPILL_DIR = _default_spill_dir()
+
+
+def read_upload(file):
+    """Return the upload contents without copying them where possible.
+
+    Streamlit uploads and BytesIO objects expose getbuffer(), which gives a
+    memoryview over the existing bytes. Other file-like objects are read
+    once; bytes and memoryviews are returned as they are.
+    """
+    if hasattr(file, 'getbuffer'):
+        return file.getbuffer()
+    if hasattr(file, 'read'):
+        data = file.read()
+        if hasattr(file, 'seek'):
+            file.seek(0)  # Reset file pointer
+        return data
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return file
+    return bytes(file)
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable stream over a bytes-like object.
+
+    Unlike io.BytesIO(memoryview) this does not copy the whole buffer up
+    front; each read() only materializes the requested slice.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(self._pos + size, len(self._view))
+        if self._pos >= end:
+            return b''
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return chunk
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        end = min(self._pos + len(b), len(self._view))
+        n = max(0, end - self._pos)
+        b[:n] = self._view[self._pos:end]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@contextmanager
+def spill_to_file(buffer, suffix='.pdf'):
+    """Write the buffer to a short-lived file for backends that need a path.
+
+    The file lives on tmpfs when available and is always removed, even if
+    the backend raises.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SPILL_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as spill_file:
+            spill_file.write(buffer)
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
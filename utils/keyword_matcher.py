@@ -0,0 +1,136 @@
+import re
+from bisect import bisect_right
+
+# Lines whose hits each matcher remembers before its line memo is reset
+LINE_MEMO_ENTRIES = 4096
+
+
+def _trie_pattern(words):
+    """Build a regex from a character trie so alternatives sharing a prefix are tried once"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if ends_here:
+            # Greedy optional group, so the longest keyword wins
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Find which of a fixed set of keywords occur in a text in one scan.
+
+    The keywords are compiled into a single trie-shaped regex inside a
+    lookahead, so the regex engine tries every position once and reports the
+    longest keyword starting there. Shorter keywords contained in a match
+    (e.g. "work" inside "work experience") are recovered from a precomputed
+    closure, so the result is the same as testing every keyword separately.
+    Keywords are matched against lowercase text.
+
+    With word_boundary=True a keyword only matches when it is not directly
+    preceded or followed by a letter, digit or underscore. The check is done
+    on the text around the match rather than with \\b, so keywords such as
+    "c++", "c#" or "node.js" still match.
+    """
+
+    def __init__(self, keywords, word_boundary=False):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        self.word_boundary = word_boundary
+        body = _trie_pattern(self.keywords)
+        if word_boundary:
+            # Backtracks to a shorter keyword when the longest one is not followed by a boundary
+            self.pattern = re.compile(r'(?<!\w)(?=(' + body + r')(?!\w))') if self.keywords else None
+        else:
+            self.pattern = re.compile('(?=(' + body + '))') if self.keywords else None
+        # keyword -> ((contained keyword, offset inside keyword), ...)
+        self.contained = {keyword: tuple(self._occurrences(keyword)) for keyword in self.keywords}
+        self.closure = {
+            keyword: frozenset(other for other, _ in contained)
+            for keyword, contained in self.contained.items()
+        }
+        self._line_hits = {}
+
+    def _occurrences(self, keyword):
+        for other in self.keywords:
+            if self.word_boundary:
+                inner = re.compile(r'(?<!\w)' + re.escape(other) + r'(?!\w)')
+                for match in inner.finditer(keyword):
+                    yield other, match.start()
+            else:
+                start = keyword.find(other)
+                while start != -1:
+                    yield other, start
+                    start = keyword.find(other, start + 1)
+
+    def finditer(self, text):
+        """Yield (offset, keyword) for the longest keyword starting at each matching offset"""
+        if self.pattern is None or not text:
+            return
+        for match in self.pattern.finditer(text):
+            yield match.start(), match.group(1)
+
+    def scan(self, text):
+        """Return the hits of finditer(text) as a list, reusing the hits of lines seen before.
+
+        No keyword contains a newline, so the hits on a line do not depend on
+        the lines around it. Hits are memoized per line, and only the lines
+        this matcher has not seen yet are scanned, joined into one text so
+        they still take a single regex pass. Re-scanning an edited resume
+        therefore only pays for the lines that changed.
+        """
+        if self.pattern is None or not text:
+            return []
+        lines = text.split('\n')
+        memo = self._line_hits
+        line_hits = {line: memo.get(line) for line in lines}
+        missing = [line for line, hits in line_hits.items() if hits is None]
+        if missing:
+            if len(memo) + len(missing) > LINE_MEMO_ENTRIES:
+                memo.clear()
+            # One regex pass over the new lines; hits are mapped back to their line by offset
+            starts = []
+            start = 0
+            for line in missing:
+                starts.append(start)
+                start += len(line) + 1
+            found = [[] for _ in missing]
+            for offset, keyword in self.finditer('\n'.join(missing)):
+                index = bisect_right(starts, offset) - 1
+                found[index].append((offset - starts[index], keyword))
+            for line, hits in zip(missing, found):
+                line_hits[line] = memo[line] = tuple(hits)
+
+        hits = []
+        start = 0
+        for line in lines:
+            for inner, keyword in line_hits[line]:
+                hits.append((start + inner, keyword))
+            start += len(line) + 1
+        return hits
+
+    def find(self, text):
+        """Return the set of keywords occurring in the (lowercase) text"""
+        found = set()
+        for _, keyword in self.scan(text):
+            found |= self.closure[keyword]
+        return found
+
+    def positions(self, text):
+        """Return {keyword: sorted offsets of every occurrence} for the (lowercase) text"""
+        hits = {}
+        for offset, keyword in self.scan(text):
+            for other, inner in self.contained[keyword]:
+                hits.setdefault(other, set()).add(offset + inner)
+        return {keyword: sorted(offsets) for keyword, offsets in hits.items()}
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+
+from .cache import DiskCache, cache_path
+
+
+def normalize_resume_text(text):
+    """Collapse whitespace and drop blank lines so re-extracted copies of a resume share a key"""
+    lines = (' '.join(line.split()) for line in (text or '').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+class ResponseCache:
+    """Disk-backed cache for LLM analyses that survives restarts.
+
+    Entries are keyed by a SHA-256 of the normalized resume text, the job
+    role, the job description, the prompt template version and the model
+    name, so changing any of them is a miss. Responses live in an SQLite
+    file with size-based LRU eviction and a TTL, after which the analysis
+    is requested again. Hits and misses are counted for the admin dashboard.
+    """
+
+    def __init__(self, db_path=None, max_bytes=None, ttl=None):
+        if db_path is None:
+            db_path = cache_path("llm_responses.db")
+        if max_bytes is None:
+            max_bytes = int(os.getenv("LLM_CACHE_MAX_MB", "64")) * 1024 * 1024
+        if ttl is None:
+            ttl = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+        self.disk = DiskCache(db_path, max_bytes=max_bytes, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(resume_text, job_role, job_description, prompt_version, model_name):
+        payload = json.dumps([
+            normalize_resume_text(resume_text), job_role or '', job_description or '',
+            prompt_version, model_name
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Return the cached response dict or None"""
+        raw = self.disk.get(key)
+        if raw is not None:
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                self.disk.delete(key)
+            else:
+                self._count(True)
+                return payload
+        self._count(False)
+        return None
+
+    def set(self, key, payload):
+        self.disk.set(key, json.dumps(payload))
+
+    def stats(self):
+        """Return hit/miss counters of this process and the size of the disk tier"""
+        entries, size = self.disk.usage()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_mb': size / (1024 * 1024)
+        }
+
+    def clear(self):
+        self.disk.clear()
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Return the process-wide LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
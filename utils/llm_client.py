@@ -0,0 +1,180 @@
+import os
+import random
+import threading
+import time
+
+import google.generativeai as genai
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # google-api-core is installed with google-generativeai, but stay importable without it
+    google_exceptions = None
+
+
+def _transient_errors():
+    errors = [ConnectionError, TimeoutError]
+    if google_exceptions is not None:
+        errors += [
+            google_exceptions.TooManyRequests,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.InternalServerError,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+        ]
+    return tuple(errors)
+
+
+# Errors worth retrying: rate limits, overloaded or unreachable backends and timeouts
+TRANSIENT_ERRORS = _transient_errors()
+
+
+class LLMError(Exception):
+    """An LLM call failed after all retries"""
+
+
+class LLMTimeoutError(LLMError):
+    """An LLM call did not finish (or start) before its deadline"""
+
+
+class LLMClient:
+    """Process-wide client for the Gemini model.
+
+    Holds one GenerativeModel per process instead of building one per
+    analysis. At most max_concurrency calls run at once; further callers
+    wait their turn on a semaphore, so bursts queue instead of piling up
+    blocked requests. Each call has a deadline covering the wait, every
+    attempt and the backoff between attempts. Transient errors are retried
+    with exponential backoff and full jitter.
+
+    `model` can be any object with the generate_content interface of
+    genai.GenerativeModel (including stream=True), such as a local fake.
+    """
+
+    def __init__(self, model_name, max_concurrency=4, timeout=60.0, max_retries=3,
+                 backoff_base=1.0, backoff_max=16.0, model=None):
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @property
+    def model(self):
+        """The shared model instance, created on first use"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def backoff(self, attempt):
+        """Seconds to wait before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _acquire(self, deadline):
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise LLMTimeoutError("Timed out waiting for a free LLM slot")
+
+    def _wait_before_retry(self, attempt, deadline, error):
+        """Sleep before retry number `attempt`, or raise when retries or time have run out"""
+        if attempt > self.max_retries:
+            raise LLMError(f"LLM call failed after {attempt} attempts: {error}") from error
+        delay = self.backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            raise LLMTimeoutError(f"LLM call did not finish before its deadline: {error}") from error
+        time.sleep(delay)
+
+    @staticmethod
+    def _remaining(deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMTimeoutError("LLM call did not finish before its deadline")
+        return remaining
+
+    def generate(self, prompt, timeout=None, generation_config=None):
+        """Return the text of the model's response to prompt.
+
+        generation_config is passed to generate_content as is, e.g. to ask
+        for a JSON response with a schema.
+
+        Raises LLMTimeoutError when no result is available within timeout
+        seconds (default: the client's timeout) and LLMError when the call
+        keeps failing with transient errors. Other errors propagate as is.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        options = {"generation_config": generation_config} if generation_config else {}
+        self._acquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                remaining = self._remaining(deadline)
+                try:
+                    response = self.model.generate_content(prompt, request_options={"timeout": remaining}, **options)
+                    return response.text
+                except TRANSIENT_ERRORS as e:
+                    attempt += 1
+                    self._wait_before_retry(attempt, deadline, e)
+        finally:
+            self._slots.release()
+
+    def stream(self, prompt, timeout=None):
+        """Yield the text of the model's response to prompt as it is generated.
+
+        Uses the streaming mode of generate_content, with the same queueing,
+        deadline and retry rules as generate(), except that a call is only
+        retried while nothing has been yielded yet; a transient error after
+        the first chunk raises LLMError. The concurrency slot is held until
+        the stream is exhausted or closed.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._acquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                remaining = self._remaining(deadline)
+                started = False
+                try:
+                    for chunk in self.model.generate_content(prompt, stream=True, request_options={"timeout": remaining}):
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            # Chunks without text parts (e.g. the final safety ratings)
+                            continue
+                        if text:
+                            started = True
+                            yield text
+                    return
+                except TRANSIENT_ERRORS as e:
+                    if started:
+                        raise LLMError(f"LLM stream was interrupted: {e}") from e
+                    attempt += 1
+                    self._wait_before_retry(attempt, deadline, e)
+        finally:
+            self._slots.release()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(model_name):
+    """Return the process-wide client for a model, configured from the environment"""
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            client = _clients[model_name] = LLMClient(
+                model_name,
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+                timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "3"))
+            )
+        return client
+
+
+def register_llm_client(client):
+    """Use `client` for its model in this process, e.g. one wrapping a local fake model"""
+    with _clients_lock:
+        _clients[client.model_name] = client
@@ -1,5 +1,51 @@
+import copy
+import hashlib
+import json
+import os
 import re
 
+import numpy as np
+import pandas as pd
+
+from .analysis_context import as_context
+from .cache import LRUCache
+from .extraction import extract_document
+from .resume_sections import SECTION_KEYWORDS, get_segmenter
+from .resume_features import SECTION_SCOPES, extract_features, section_features
+from .role_recommender import get_role_recommender
+from .timings import StageTimer
+from .skill_matcher import match_skills, iter_roles, skill_presence_matrix, role_weight_matrix, ROLE_CATEGORIES
+
+# Weight of each section score in the overall ATS score
+ATS_WEIGHTS = {
+    'contact': 0.1,     # 10% weight for contact info
+    'summary': 0.1,     # 10% weight for summary
+    'skills': 0.3,      # 30% weight for skills match
+    'experience': 0.2,  # 20% weight for experience
+    'education': 0.1,   # 10% weight for education
+    'format': 0.2       # 20% weight for formatting
+}
+
+# Bump when the analysis logic changes in a way ATS_WEIGHTS does not capture
+ANALYSIS_VERSION = "1"
+
+# Cached role-independent stages, keyed by (text hash, ANALYSIS_VERSION)
+_document_cache = LRUCache(int(os.getenv("ANALYSIS_CACHE_ENTRIES", "128")))
+# Cached final results, keyed by (text hash, role, scoring version)
+_result_cache = LRUCache(int(os.getenv("ANALYSIS_CACHE_ENTRIES", "128")))
+# Cached per-section results, keyed by (section, content hash, ANALYSIS_VERSION)
+_section_cache = LRUCache(int(os.getenv("SECTION_CACHE_ENTRIES", "512")))
+
+
+def scoring_version():
+    """Version of the scoring, derived from ANALYSIS_VERSION and the current ATS_WEIGHTS"""
+    payload = json.dumps([ANALYSIS_VERSION, sorted(ATS_WEIGHTS.items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Words that mark the opening lines as contact details rather than a summary
+CONTACT_WORDS_RE = re.compile(r'\b(?:email|phone|address|tel|mobile|linkedin)\b', re.IGNORECASE)
+
 class ResumeAnalyzer:
     def __init__(self):
         # Document type indicators
@@ -23,14 +69,15 @@ class ResumeAnalyzer:
         }
         
     def detect_document_type(self, text):
-        text = text.lower()
+        context = as_context(text)
+        text = context.lower
         scores = {}
         
         # Calculate score for each document type
         for doc_type, keywords in self.document_types.items():
             matches = sum(1 for keyword in keywords if keyword in text)
             density = matches / len(keywords)
-            frequency = matches / (len(text.split()) + 1)  # Add 1 to avoid division by zero
+            frequency = matches / (context.word_count + 1)  # Add 1 to avoid division by zero
             scores[doc_type] = (density * 0.7) + (frequency * 0.3)
         
         # Get the highest scoring document type
@@ -40,31 +87,57 @@ class ResumeAnalyzer:
         return best_match[0] if best_match[1] > 0.15 else 'unknown'
         
     def calculate_keyword_match(self, resume_text, required_skills):
-        resume_text = resume_text.lower()
-        found_skills = []
-        missing_skills = []
-        
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            # Check for exact match
-            if skill_lower in resume_text:
-                found_skills.append(skill)
-            # Check for partial matches (e.g., "Python" in "Python programming")
-            elif any(skill_lower in phrase for phrase in resume_text.split('.')):
-                found_skills.append(skill)
-            else:
-                missing_skills.append(skill)
+        resume_text = as_context(resume_text).lower
+        # One scan with the role's precompiled matcher; skills only match as whole words
+        positions = match_skills(resume_text, required_skills)
+        found_skills = [skill for skill in required_skills if skill in positions]
+        missing_skills = [skill for skill in required_skills if skill not in positions]
                 
         match_score = (len(found_skills) / len(required_skills)) * 100 if required_skills else 0
         
         return {
             'score': match_score,
             'found_skills': found_skills,
-            'missing_skills': missing_skills
+            'missing_skills': missing_skills,
+            'positions': positions
         }
         
+    def analyze_batch(self, texts, roles=None, names=None):
+        """Score the keyword match of many resumes against many roles at once.
+
+        Each resume is scanned once against the union of all required skills
+        in JOB_ROLES to build a boolean presence matrix; the scores for every
+        (resume, role) pair are then a single matrix product with the role
+        weight matrix. `roles` defaults to every role in JOB_ROLES and
+        `names` to the position of each text.
+
+        Returns a DataFrame with one row per (resume, role), ranked within
+        each role by keyword score (rank 1 is the best match).
+        """
+        texts = list(texts)
+        roles = list(roles) if roles else [role for _, role, _ in iter_roles()]
+        names = list(names) if names is not None else list(range(len(texts)))
+        if len(names) != len(texts):
+            raise ValueError("names must have one entry per resume")
+
+        presence = skill_presence_matrix(texts)
+        weights = role_weight_matrix(roles)
+        scores = presence @ weights * 100
+        matched = presence.astype(np.int32) @ (weights > 0).astype(np.int32)
+
+        results = pd.DataFrame({
+            'resume': np.repeat(np.asarray(names, dtype=object), len(roles)),
+            'role': np.tile(np.asarray(roles, dtype=object), len(texts)),
+            'category': np.tile(np.asarray([ROLE_CATEGORIES[role] for role in roles], dtype=object), len(texts)),
+            'keyword_score': scores.ravel(),
+            'matched_skills': matched.ravel(),
+            'required_skills': np.tile((weights > 0).sum(axis=0), len(texts))
+        })
+        results['rank'] = results.groupby('role')['keyword_score'].rank(ascending=False, method='min').astype(int)
+        return results.sort_values(['role', 'rank', 'resume'], kind='stable').reset_index(drop=True)
+
     def check_resume_sections(self, text):
-        text = text.lower()
+        text = as_context(text).lower
         essential_sections = {
             'contact': ['email', 'phone', 'address', 'linkedin'],
             'education': ['education', 'university', 'college', 'degree', 'academic'],
@@ -80,525 +153,420 @@ class ResumeAnalyzer:
         return sum(section_scores.values())
         
     def check_formatting(self, text):
-        lines = text.split('\n')
+        features = self.extract_features(text)
         score = 100
         deductions = []
         
         # Check for minimum content
-        if len(text) < 300:
+        if features['too_short']:
             score -= 30
             deductions.append("Resume is too short")
             
-        # Check for section headers
-        if not any(line.isupper() for line in lines):
+        # Check for section headers (all-caps lines or lines set in a larger font)
+        if not features['has_headings']:
             score -= 20
             deductions.append("No clear section headers found")
             
         # Check for bullet points
-        if not any(line.strip().startswith(('•', '-', '*', '→')) for line in lines):
+        if not features['has_bullets']:
             score -= 20
             deductions.append("No bullet points found for listing details")
             
         # Check for consistent spacing
-        if any(len(line.strip()) == 0 and len(next_line.strip()) == 0 
-               for line, next_line in zip(lines[:-1], lines[1:])):
+        if features['double_blank_lines']:
             score -= 15
             deductions.append("Inconsistent spacing between sections")
             
         # Check for contact information format
-        contact_patterns = [
-            r'\b[\w\.-]+@[\w\.-]+\.\w+\b',  # email
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # phone
-            r'linkedin\.com/\w+',  # LinkedIn
-        ]
-        if not any(re.search(pattern, text) for pattern in contact_patterns):
+        if not (features['contact_email'] or features['contact_phone'] or features['contact_linkedin']):
             score -= 15
             deductions.append("Missing or improperly formatted contact information")
             
         return max(0, score), deductions
         
     def extract_text_from_pdf(self, file):
-        try:
-            import PyPDF2
-            import io
-            
-            # Create a PDF reader object
-            # First make sure we have the file content as bytes
-            if hasattr(file, 'read'):
-                # If it's already a file-like object, read it
-                file_content = file.read()
-                file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = file
-                
-            # Create BytesIO from bytes content
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            
-            # Extract text from all pages
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-                
-            return text
-        except Exception as e:
-            raise Exception(f"Error extracting text from PDF: {str(e)}")
+        """Extract text from a PDF file"""
+        result = extract_document(file, kind='pdf')
+        if result.error:
+            raise Exception(f"Error extracting text from PDF: {result.error}")
+        return result.text
             
     def extract_text_from_docx(self, docx_file):
         """Extract text from a DOCX file"""
-        try:
-            from docx import Document
-            doc = Document(docx_file)
-            full_text = []
-            for paragraph in doc.paragraphs:
-                full_text.append(paragraph.text)
-            return '\n'.join(full_text)
-        except Exception as e:
-            raise Exception(f"Error extracting text from DOCX file: {str(e)}")
+        result = extract_document(docx_file, kind='docx')
+        if result.error:
+            raise Exception(f"Error extracting text from DOCX file: {result.error}")
+        return result.text
 
     def extract_personal_info(self, text):
         """Extract personal information from resume text"""
-        # Basic patterns for personal info
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        phone_pattern = r'(\+\d{1,3}[-.]?)?\s*\(?\d{3}\)?[-.]?\s*\d{3}[-.]?\s*\d{4}'
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        github_pattern = r'github\.com/[\w-]+'
-        
-        # Extract information
-        email = re.search(email_pattern, text)
-        phone = re.search(phone_pattern, text)
-        linkedin = re.search(linkedin_pattern, text)
-        github = re.search(github_pattern, text)
+        context = as_context(text)
+        features = self.extract_features(context)
         
-        # Get the first line as name (basic assumption)
-        name = text.split('\n')[0].strip()
+        # The name is the largest line at the top, or the first line without font data
+        title_line = context.document.title_line()
+        name = title_line.text if title_line else ''
         
         return {
             'name': name if len(name) > 0 else 'Unknown',
-            'email': email.group(0) if email else '',
-            'phone': phone.group(0) if phone else '',
-            'linkedin': linkedin.group(0) if linkedin else '',
-            'github': github.group(0) if github else '',
+            'email': features['email'],
+            'phone': features['phone'],
+            'linkedin': features['linkedin'],
+            'github': features['github'],
             'portfolio': ''  # Can be enhanced later
         }
 
-    def extract_education(self, text):
-        """Extract education information from resume text"""
-        education = []
-        lines = text.split('\n')
-        education_keywords = [
-            'education', 'academic', 'qualification', 'degree', 'university', 'college',
-            'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
-            'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
-            'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
-        ]
-        in_education_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in education_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in education_keywords):
-                    # This line contains education info, not just a header
-                    current_entry.append(line)
-                in_education_section = True
-                continue
-            
-            if in_education_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(edu_key.lower() in line.lower() for edu_key in education_keywords):
-                        in_education_section = False
-                        if current_entry:
-                            education.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    education.append(' '.join(current_entry))
-                    current_entry = []
+    def segment_sections(self, text):
+        """Split the resume into sections in a single pass over its lines"""
+        context = as_context(text)
+        if context.sections is None:
+            context.sections = get_segmenter(tuple(self.document_types['resume'])).segment(context.document)
+        return context.sections
+
+    def extract_features(self, text, use_cache=True):
+        """Formatting and quality features, shared by the scores and the suggestions"""
+        context = as_context(text)
+        if context.features is None:
+            context.features = extract_features(
+                context.document,
+                scope_features={
+                    scope: self.analyze_section(context, scope, use_cache)['features'] for scope in SECTION_SCOPES
+                }
+            )
+        return context.features
+
+    def _section_key(self, context, section):
+        digest = self.segment_sections(context).digest(section)
+        if section == 'summary':
+            # The summary can also be taken from the opening lines of the resume
+            opening = json.dumps([line.text for line in context.document.non_empty_lines[:5]], ensure_ascii=False)
+            digest = hashlib.sha256((digest + opening).encode('utf-8')).hexdigest()
+        return (section, digest, ANALYSIS_VERSION)
+
+    def analyze_section(self, text, section, use_cache=True):
+        """Entries, feature flags and suggestions of one section, memoized by its content.
+
+        Every detected section is hashed after segmentation, so re-analyzing
+        an edited resume only recomputes the sections whose hash changed and
+        reuses the cached results of the others. With use_cache=False the
+        section cache is neither read nor written.
+        """
+        context = as_context(text)
+        if not use_cache:
+            return self._compute_section(context, section)
+        key = self._section_key(context, section)
+        part = _section_cache.get(key)
+        if part is None:
+            part = self._compute_section(context, section)
+            _section_cache.set(key, part)
+        return part
+
+    def _compute_section(self, context, section):
+        entries = self.segment_sections(context).entries(section)
+        features = section_features(section, entries) if section in SECTION_SCOPES else {}
+        value = entries
+        suggestions = []
         
-        if current_entry:
-            education.append(' '.join(current_entry))
+        if section == 'summary':
+            value = self.extract_summary(context)
+            summary_words = context.count_words(value)
+            if not value:
+                suggestions.append("Add a professional summary to highlight your key qualifications")
+            elif summary_words < 30:
+                suggestions.append("Expand your professional summary to better highlight your experience and goals")
+            elif summary_words > 100:
+                suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
         
-        return education
+        elif section == 'skills':
+            # The role-dependent skills suggestion is added by _score_for_role
+            value = list(self.extract_skills(context))
+            if not value:
+                suggestions.append("Add a dedicated skills section")
+            if len(value) < 5:
+                suggestions.append("List more relevant technical and soft skills")
+        
+        elif section == 'experience':
+            if not entries:
+                suggestions.append("Add your work experience section")
+            else:
+                if not features['experience_dates']:
+                    suggestions.append("Include dates for each work experience")
+                if not features['experience_bullets']:
+                    suggestions.append("Use bullet points to list your achievements and responsibilities")
+                if not features['experience_action_verbs']:
+                    suggestions.append("Start bullet points with strong action verbs")
+        
+        elif section == 'education':
+            # The GPA suggestion depends on the role and is added by _score_for_role
+            if not entries:
+                suggestions.append("Add your educational background")
+            else:
+                if not features['education_dates']:
+                    suggestions.append("Include graduation dates")
+                if not features['education_degree']:
+                    suggestions.append("Specify your degree type")
+        
+        return {'value': value, 'features': features, 'suggestions': suggestions}
+
+    def extract_education(self, text):
+        """Extract education information from resume text"""
+        sections = self.segment_sections(text)
+        return sections.entries('education')
 
     def extract_experience(self, text):
         """Extract work experience information from resume text"""
-        experience = []
-        lines = text.split('\n')
-        experience_keywords = [
-            'experience', 'employment', 'work history', 'professional experience',
-            'work experience', 'career history', 'professional background',
-            'employment history', 'job history', 'positions held', 'experience',
-            'job title', 'job responsibilities', 'job description', 'job summary'
-        ]
-        in_experience_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in experience_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in experience_keywords):
-                    # This line contains experience info, not just a header
-                    current_entry.append(line)
-                in_experience_section = True
-                continue
-            
-            if in_experience_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(exp_key.lower() in line.lower() for exp_key in experience_keywords):
-                        in_experience_section = False
-                        if current_entry:
-                            experience.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    experience.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            experience.append(' '.join(current_entry))
-        
-        return experience
+        sections = self.segment_sections(text)
+        return sections.entries('experience')
 
     def extract_projects(self, text):
         """Extract project information from resume text"""
-        projects = []
-        lines = text.split('\n')
-        project_keywords = [
-            'projects', 'personal projects', 'academic projects', 'key projects',
-            'major projects', 'professional projects', 'project experience',
-            'relevant projects', 'featured projects','latest projects',
-            'top projects'
-        ]
-        in_project_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in project_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in project_keywords):
-                    # This line contains project info, not just a header
-                    current_entry.append(line)
-                in_project_section = True
-                continue
-            
-            if in_project_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(proj_key.lower() in line.lower() for proj_key in project_keywords):
-                        in_project_section = False
-                        if current_entry:
-                            projects.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    projects.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            projects.append(' '.join(current_entry))
-        
-        return projects
+        sections = self.segment_sections(text)
+        return sections.entries('projects')
 
     def extract_skills(self, text):
         """Extract skills from resume text"""
+        sections = self.segment_sections(text)
         skills = set()  # Use set to avoid duplicates
-        lines = text.split('\n')
-        skills_keywords = [
-            'skills', 'technical skills', 'competencies', 'expertise',
-            'core competencies', 'professional skills', 'key skills',
-            'technical expertise', 'proficiencies', 'qualifications',
-            'top skills', 'key skill', 'major skill', 'personal skill',
-            'soft skills', 'soft skill', 'soft skillset'
-        ]
-        in_skills_section = False
-        current_entry = []
 
         # Common skill separators
         separators = [',', '•', '|', '/', '\\', '·', '>', '-', '–', '―']
 
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in skills_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in skills_keywords):
-                    # This line contains skills, not just a header
-                    current_entry.append(line)
-                in_skills_section = True
-                continue
-            
-            if in_skills_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(skill_key.lower() in line.lower() for skill_key in skills_keywords):
-                        in_skills_section = False
-                        if current_entry:
-                            # Process the current entry
-                            text_to_process = ' '.join(current_entry)
-                            # Split by common separators
-                            for separator in separators:
-                                if separator in text_to_process:
-                                    skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    # Process the current entry
-                    text_to_process = ' '.join(current_entry)
-                    # Split by common separators
-                    for separator in separators:
-                        if separator in text_to_process:
-                            skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                    current_entry = []
-        
-        if current_entry:
-            # Process any remaining skills
-            text_to_process = ' '.join(current_entry)
+        for text_to_process in sections.entries('skills'):
+            # Split by common separators
             for separator in separators:
                 if separator in text_to_process:
                     skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-        
+
         return list(skills)
 
     def extract_summary(self, text):
         """Extract summary/objective from resume text"""
+        context = as_context(text)
+        sections = self.segment_sections(context)
+        summary_keywords = SECTION_KEYWORDS['summary']
         summary = []
-        lines = text.split('\n')
-        summary_keywords = [
-            'summary', 'professional summary', 'career summary', 'objective',
-            'career objective', 'professional objective', 'about me', 'profile',
-            'professional profile', 'career profile', 'overview', 'skill summary'
-        ]
-        in_summary_section = False
-        current_entry = []
-
-        # Try to find summary at the beginning of the resume
-        start_index = 0
-        while start_index < min(10, len(lines)) and not lines[start_index].strip():
-            start_index += 1
 
         # Check first few non-empty lines for potential summary
-        first_lines = []
-        lines_checked = 0
-        for line in lines[start_index:]:
-            if line.strip():
-                first_lines.append(line.strip())
-                lines_checked += 1
-                if lines_checked >= 5:  # Check first 5 non-empty lines
-                    break
+        first_lines = context.document.non_empty_lines[:5]
 
         # If first few lines look like a summary (no special formatting, no contact info)
-        if first_lines and not any(keyword in first_lines[0].lower() for keyword in summary_keywords):
-            potential_summary = ' '.join(first_lines)
-            if len(potential_summary.split()) > 10:  # More than 10 words
-                if not re.search(r'\b(?:email|phone|address|tel|mobile|linkedin)\b', potential_summary.lower()):
+        if first_lines and not any(keyword in first_lines[0].lower for keyword in summary_keywords):
+            potential_summary = ' '.join(line.text for line in first_lines)
+            if context.count_words(potential_summary) > 10:  # More than 10 words
+                if not CONTACT_WORDS_RE.search(potential_summary):
                     summary.append(potential_summary)
 
         # Look for explicitly marked summary section
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in summary_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in summary_keywords):
-                    # This line contains summary info, not just a header
-                    current_entry.append(line)
-                in_summary_section = True
-                continue
-            
-            if in_summary_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(sum_key.lower() in line.lower() for sum_key in summary_keywords):
-                        in_summary_section = False
-                        if current_entry:
-                            summary.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    summary.append(' '.join(current_entry))
-                    current_entry = []
+        summary.extend(sections.entries('summary'))
+
+        return ' '.join(summary) if summary else ''
+
+    @staticmethod
+    def _role_key(job_requirements):
+        """Everything about the role that the analysis depends on, as a hashable key"""
+        return (
+            tuple(job_requirements.get('required_skills', [])),
+            bool(job_requirements.get('require_gpa', False))
+        )
+
+    def _analyze_document(self, context, timer, use_cache=True):
+        """Run every role-independent stage once and return its results"""
+        # First detect document type
+        with timer.stage('document_type'):
+            doc_type = self.detect_document_type(context)
+        if doc_type != 'resume':
+            return {'document_type': doc_type}
         
-        if current_entry:
-            summary.append(' '.join(current_entry))
+        # Split the resume into sections once; the extractors below read from the map
+        with timer.stage('sections'):
+            self.segment_sections(context)
         
-        return ' '.join(summary) if summary else ''
+        # Entries, features and suggestions of each section, reused from earlier analyses when unchanged
+        with timer.stage('section_parts'):
+            parts = {section: self.analyze_section(context, section, use_cache) for section in SECTION_KEYWORDS}
+        
+        # Formatting and quality features, shared by the scores and the suggestions
+        with timer.stage('features'):
+            features = self.extract_features(context, use_cache)
+        
+        # Extract personal information
+        with timer.stage('personal_info'):
+            personal_info = self.extract_personal_info(context)
+        
+        # Roles the resume fits best, from one scan over the inverted skill index
+        with timer.stage('role_recommendation'):
+            recommended_roles = get_role_recommender().recommend(context.document)
+        
+        # Check resume sections
+        with timer.stage('section_check'):
+            section_score = self.check_resume_sections(context)
+        
+        # Check formatting
+        with timer.stage('formatting'):
+            format_score, format_deductions = self.check_formatting(context)
+        
+        # Contact details are read from the whole document, not from a section
+        contact_suggestions = []
+        if not personal_info.get('email'):
+            contact_suggestions.append("Add your email address")
+        if not personal_info.get('phone'):
+            contact_suggestions.append("Add your phone number")
+        if not personal_info.get('linkedin'):
+            contact_suggestions.append("Add your LinkedIn profile URL")
+        
+        format_suggestions = []
+        if format_score < 100:
+            format_suggestions.extend(format_deductions)
+        
+        return {
+            'document_type': 'resume',
+            'personal_info': personal_info,
+            'section_score': section_score,
+            'format_score': format_score,
+            'education': parts['education']['value'],
+            'experience': parts['experience']['value'],
+            'projects': parts['projects']['value'],
+            'skills': parts['skills']['value'],
+            'summary': parts['summary']['value'],
+            'recommended_roles': recommended_roles,
+            'features': features,
+            'contact_suggestions': contact_suggestions,
+            'summary_suggestions': parts['summary']['suggestions'],
+            'skills_suggestions': parts['skills']['suggestions'],
+            'experience_suggestions': parts['experience']['suggestions'],
+            'education_suggestions': parts['education']['suggestions'],
+            'format_suggestions': format_suggestions
+        }
+
+    def _score_for_role(self, context, base, job_requirements, timer):
+        """Run the role-dependent keyword stage and assemble the final result"""
+        if base['document_type'] != 'resume':
+            doc_type = base['document_type']
+            return {
+                'ats_score': 0,
+                'document_type': doc_type,
+                'keyword_match': {'score': 0, 'found_skills': [], 'missing_skills': []},
+                'section_score': 0,
+                'format_score': 0,
+                'suggestions': [f"This appears to be a {doc_type} document. Please upload a resume for ATS analysis."]
+            }
+        
+        # Calculate keyword match
+        required_skills = job_requirements.get('required_skills', [])
+        with timer.stage('keyword_match'):
+            keyword_match = self.calculate_keyword_match(context, required_skills)
+        
+        contact_suggestions = list(base['contact_suggestions'])
+        summary_suggestions = list(base['summary_suggestions'])
+        skills_suggestions = list(base['skills_suggestions'])
+        if keyword_match['score'] < 70:
+            skills_suggestions.append("Add more skills that match the job requirements")
+        experience_suggestions = list(base['experience_suggestions'])
+        education_suggestions = list(base['education_suggestions'])
+        if base['education'] and not base['features']['education_gpa'] and job_requirements.get('require_gpa', False):
+            education_suggestions.append("Include your GPA if it's above 3.0")
+        format_suggestions = list(base['format_suggestions'])
+        format_score = base['format_score']
+        
+        # Calculate section-specific scores
+        contact_score = 100 - (len(contact_suggestions) * 25)  # -25 for each missing item
+        summary_score = 100 - (len(summary_suggestions) * 33)  # -33 for each issue
+        skills_score = keyword_match['score']
+        experience_score = 100 - (len(experience_suggestions) * 25)
+        education_score = 100 - (len(education_suggestions) * 25)
+        section_scores = {
+            'contact': contact_score,
+            'summary': summary_score,
+            'skills': skills_score,
+            'experience': experience_score,
+            'education': education_score,
+            'format': format_score
+        }
+        
+        # Calculate overall ATS score with weighted components
+        ats_score = sum(int(round(section_scores[name] * weight)) for name, weight in ATS_WEIGHTS.items())
+        
+        # Combine all suggestions into a single list
+        suggestions = []
+        suggestions.extend(contact_suggestions)
+        suggestions.extend(summary_suggestions)
+        suggestions.extend(skills_suggestions)
+        suggestions.extend(experience_suggestions)
+        suggestions.extend(education_suggestions)
+        suggestions.extend(format_suggestions)
+        
+        if not suggestions:
+            suggestions.append("Your resume is well-optimized for ATS systems")
+        
+        # Return final structured result
+        return {
+            **base['personal_info'],  # Include extracted personal info
+            'ats_score': ats_score,
+            'document_type': 'resume',
+            'keyword_match': keyword_match,
+            'section_score': base['section_score'],
+            'format_score': format_score,
+            'education': base['education'],
+            'experience': base['experience'],
+            'projects': base['projects'],
+            'skills': base['skills'],
+            'summary': base['summary'],
+            'recommended_roles': base['recommended_roles'],
+            'features': base['features'],
+            'suggestions': suggestions,
+            'contact_suggestions': contact_suggestions,
+            'summary_suggestions': summary_suggestions,
+            'skills_suggestions': skills_suggestions,
+            'experience_suggestions': experience_suggestions,
+            'education_suggestions': education_suggestions,
+            'format_suggestions': format_suggestions,
+            'section_scores': section_scores
+        }
+
+    def analyze_resume(self, resume_data, job_requirements, use_cache=True):
+        """Analyze resume and return scores and recommendations.
+
+        Results are cached by (text hash, role, scoring version). When only
+        the role changes, the cached role-independent stages are reused and
+        just the keyword stage is recomputed. The scoring version is derived
+        from ATS_WEIGHTS, so changing a weight invalidates cached results.
 
-    def analyze_resume(self, resume_data, job_requirements):
-        """Analyze resume and return scores and recommendations"""
+        Stage durations of this call are returned in 'timings' (milliseconds)
+        and recorded in the process-wide timing registry.
+        """
+        timer = StageTimer('standard')
         try:
             text = resume_data.get('raw_text', '')
+            document = resume_data.get('document')
+            text_hash = hashlib.sha256((document.text if document is not None else text).encode('utf-8')).hexdigest()
+            version = scoring_version()
+            result_key = (text_hash, self._role_key(job_requirements), version)
             
-            # Extract personal information
-            personal_info = self.extract_personal_info(text)
-            
-            # First detect document type
-            doc_type = self.detect_document_type(text)
-            if doc_type != 'resume':
-                return {
-                    'ats_score': 0,
-                    'document_type': doc_type,
-                    'keyword_match': {'score': 0, 'found_skills': [], 'missing_skills': []},
-                    'section_score': 0,
-                    'format_score': 0,
-                    'suggestions': [f"This appears to be a {doc_type} document. Please upload a resume for ATS analysis."]
-                }
-                
-            # Calculate keyword match
-            required_skills = job_requirements.get('required_skills', [])
-            keyword_match = self.calculate_keyword_match(text, required_skills)
-            
-            # Extract all resume sections
-            education = self.extract_education(text)
-            experience = self.extract_experience(text)
-            projects = self.extract_projects(text)
-            skills = list(self.extract_skills(text))  # Convert skills set to list
-            summary = self.extract_summary(text)
+            with timer.stage('cache_lookup'):
+                cached = _result_cache.get(result_key) if use_cache else None
+                analyzed = None
+                if cached is None and use_cache:
+                    analyzed = _document_cache.get((text_hash, ANALYSIS_VERSION))
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result['timings'] = timer.finish()
+                return result
             
-            # Check resume sections
-            section_score = self.check_resume_sections(text)
-            
-            # Check formatting
-            format_score, format_deductions = self.check_formatting(text)
-            
-            # Generate section-specific suggestions
-            contact_suggestions = []
-            if not personal_info.get('email'):
-                contact_suggestions.append("Add your email address")
-            if not personal_info.get('phone'):
-                contact_suggestions.append("Add your phone number")
-            if not personal_info.get('linkedin'):
-                contact_suggestions.append("Add your LinkedIn profile URL")
-            
-            summary_suggestions = []
-            if not summary:
-                summary_suggestions.append("Add a professional summary to highlight your key qualifications")
-            elif len(summary.split()) < 30:
-                summary_suggestions.append("Expand your professional summary to better highlight your experience and goals")
-            elif len(summary.split()) > 100:
-                summary_suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
-            
-            skills_suggestions = []
-            if not skills:
-                skills_suggestions.append("Add a dedicated skills section")
-            if isinstance(skills, (list, set)) and len(list(skills)) < 5:
-                skills_suggestions.append("List more relevant technical and soft skills")
-            if keyword_match['score'] < 70:
-                skills_suggestions.append("Add more skills that match the job requirements")
-            
-            experience_suggestions = []
-            if not experience:
-                experience_suggestions.append("Add your work experience section")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
-                has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
-                has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
-                                               exp.lower()) for exp in experience)
-                
-                if not has_dates:
-                    experience_suggestions.append("Include dates for each work experience")
-                if not has_bullets:
-                    experience_suggestions.append("Use bullet points to list your achievements and responsibilities")
-                if not has_action_verbs:
-                    experience_suggestions.append("Start bullet points with strong action verbs")
+            if analyzed is None:
+                # Split, lowercase, tokenize and flag headings once; every stage below reads from it
+                with timer.stage('context'):
+                    context = as_context(document or text)
+                analyzed = (context, self._analyze_document(context, timer, use_cache))
+                if use_cache:
+                    _document_cache.set((text_hash, ANALYSIS_VERSION), analyzed)
+            context, base = analyzed
             
-            education_suggestions = []
-            if not education:
-                education_suggestions.append("Add your educational background")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
-                has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
-                                         edu.lower()) for edu in education)
-                has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
-                                      edu.lower()) for edu in education)
-                
-                if not has_dates:
-                    education_suggestions.append("Include graduation dates")
-                if not has_degree:
-                    education_suggestions.append("Specify your degree type")
-                if not has_gpa and job_requirements.get('require_gpa', False):
-                    education_suggestions.append("Include your GPA if it's above 3.0")
-            
-            format_suggestions = []
-            if format_score < 100:
-                format_suggestions.extend(format_deductions)
-            
-            # Calculate section-specific scores
-            contact_score = 100 - (len(contact_suggestions) * 25)  # -25 for each missing item
-            summary_score = 100 - (len(summary_suggestions) * 33)  # -33 for each issue
-            skills_score = keyword_match['score']
-            experience_score = 100 - (len(experience_suggestions) * 25)
-            education_score = 100 - (len(education_suggestions) * 25)
-            
-            # Calculate overall ATS score with weighted components
-            ats_score = (
-                int(round(contact_score * 0.1)) +      # 10% weight for contact info
-                int(round(summary_score * 0.1)) +      # 10% weight for summary
-                int(round(skills_score * 0.3)) +       # 30% weight for skills match
-                int(round(experience_score * 0.2)) +   # 20% weight for experience
-                int(round(education_score * 0.1)) +    # 10% weight for education
-                int(round(format_score * 0.2))         # 20% weight for formatting
-            )
-            
-            # Combine all suggestions into a single list
-            suggestions = []
-            suggestions.extend(contact_suggestions)
-            suggestions.extend(summary_suggestions)
-            suggestions.extend(skills_suggestions)
-            suggestions.extend(experience_suggestions)
-            suggestions.extend(education_suggestions)
-            suggestions.extend(format_suggestions)
-            
-            if not suggestions:
-                suggestions.append("Your resume is well-optimized for ATS systems")
-            
-            # Return final structured result
-            return {
-                **personal_info,  # Include extracted personal info
-                'ats_score': ats_score,
-                'document_type': 'resume',
-                'keyword_match': keyword_match,
-                'section_score': section_score,
-                'format_score': format_score,
-                'education': education,
-                'experience': experience,
-                'projects': projects,
-                'skills': skills,
-                'summary': summary,
-                'suggestions': suggestions,
-                'contact_suggestions': contact_suggestions,
-                'summary_suggestions': summary_suggestions,
-                'skills_suggestions': skills_suggestions,
-                'experience_suggestions': experience_suggestions,
-                'education_suggestions': education_suggestions,
-                'format_suggestions': format_suggestions,
-                'section_scores': {
-                    'contact': contact_score,
-                    'summary': summary_score,
-                    'skills': skills_score,
-                    'experience': experience_score,
-                    'education': education_score,
-                    'format': format_score
-                }
-            }
+            result = self._score_for_role(context, base, job_requirements, timer)
+            if use_cache:
+                _result_cache.set(result_key, result)
+            result = copy.deepcopy(result)
+            result['timings'] = timer.finish()
+            return result
         except Exception as e:
             import traceback
             print(f"Error analyzing resume: {str(e)}")
@@ -612,4 +580,5 @@ class ResumeAnalyzer:
                 'section_score': 0,
                 'format_score': 0,
                 'suggestions': [f"Error analyzing resume: {str(e)}. Please check your file and try again."]
-            }
\ No newline at end of file
+            }
+
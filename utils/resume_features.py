@@ -0,0 +1,122 @@
+import re
+
+# Lines starting with one of these count as bullet points
+BULLET_PREFIXES = ('•', '-', '*', '→')
+
+# Minimum number of characters before a resume stops counting as too short
+MIN_RESUME_CHARS = 300
+
+
+class Feature:
+    """A named regex feature evaluated once over one scope of the resume.
+
+    scope is 'document' for the whole text or the name of a section whose
+    entries are searched. With capture=True the feature's value is the
+    first matched string ('' if none), otherwise a bool.
+    """
+
+    __slots__ = ('name', 'scope', 'pattern', 'capture')
+
+    def __init__(self, name, scope, pattern, flags=0, capture=False):
+        self.name = name
+        self.scope = scope
+        self.pattern = re.compile(pattern, flags)
+        self.capture = capture
+
+
+# Compiled once at import; order defines the order of the feature vector
+FEATURES = [
+    # Contact details shown to the user
+    Feature('email', 'document', r'[\w\.-]+@[\w\.-]+\.\w+', capture=True),
+    Feature('phone', 'document', r'(\+\d{1,3}[-.]?)?\s*\(?\d{3}\)?[-.]?\s*\d{3}[-.]?\s*\d{4}', capture=True),
+    Feature('linkedin', 'document', r'linkedin\.com/in/[\w-]+', capture=True),
+    Feature('github', 'document', r'github\.com/[\w-]+', capture=True),
+    # Stricter contact formats checked by the formatting score
+    Feature('contact_email', 'document', r'\b[\w\.-]+@[\w\.-]+\.\w+\b'),
+    Feature('contact_phone', 'document', r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    Feature('contact_linkedin', 'document', r'linkedin\.com/\w+'),
+    # Quality of the experience entries
+    Feature('experience_dates', 'experience', r'\b(19|20)\d{2}\b'),
+    Feature('experience_bullets', 'experience', r'[•\-\*]'),
+    Feature('experience_action_verbs', 'experience',
+            r'\b(developed|managed|created|implemented|designed|led|improved)\b', re.IGNORECASE),
+    # Quality of the education entries
+    Feature('education_dates', 'education', r'\b(19|20)\d{2}\b'),
+    Feature('education_degree', 'education', r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', re.IGNORECASE),
+    Feature('education_gpa', 'education', r'\b(gpa|cgpa|grade|percentage)\b', re.IGNORECASE),
+]
+
+# Features computed from the line structure rather than a regex
+LINE_FEATURES = ['too_short', 'has_headings', 'has_bullets', 'double_blank_lines']
+
+FEATURE_NAMES = [feature.name for feature in FEATURES] + LINE_FEATURES
+
+
+def _line_features(document):
+    """Layout features from a single walk over the document lines"""
+    has_headings = has_bullets = double_blank_lines = False
+    previous_blank = False
+    for line in document.lines:
+        if not line.text:
+            double_blank_lines = double_blank_lines or previous_blank
+            previous_blank = True
+            continue
+        previous_blank = False
+        has_headings = has_headings or line.heading
+        has_bullets = has_bullets or line.text.startswith(BULLET_PREFIXES)
+    return {
+        'too_short': len(document.text) < MIN_RESUME_CHARS,
+        'has_headings': has_headings,
+        'has_bullets': has_bullets,
+        'double_blank_lines': double_blank_lines,
+    }
+
+
+# Sections that have features of their own, in FEATURES order
+SECTION_SCOPES = list(dict.fromkeys(feature.scope for feature in FEATURES if feature.scope != 'document'))
+
+
+def _evaluate(scope, text):
+    features = {}
+    for feature in FEATURES:
+        if feature.scope == scope:
+            match = feature.pattern.search(text)
+            features[feature.name] = (match.group(0) if match else '') if feature.capture else bool(match)
+    return features
+
+
+def document_features(document):
+    """Features that read the whole document: contact details and layout"""
+    features = _evaluate('document', document.text)
+    features.update(_line_features(document))
+    return features
+
+
+def section_features(scope, entries):
+    """Features of one section, from its entries alone.
+
+    None of the section patterns can match across a newline, so searching
+    the entries joined by newlines is equivalent to testing them one by one.
+    """
+    return _evaluate(scope, '\n'.join(entries))
+
+
+def extract_features(document, sections=None, scope_features=None):
+    """Compute every formatting and quality feature of a resume in one pass.
+
+    Each scope's text is assembled once (the whole document, or a section's
+    entries joined by newlines) and each registered pattern is searched at
+    most once in it, instead of once per entry. scope_features can supply
+    the features of sections computed earlier (e.g. cached per section);
+    the other sections are evaluated from `sections`, and features of
+    sections that were not segmented are False. The result is keyed and
+    ordered by FEATURE_NAMES and is what both the scores and the
+    suggestions read.
+    """
+    features = document_features(document)
+    for scope in SECTION_SCOPES:
+        known = (scope_features or {}).get(scope)
+        if known is None:
+            known = section_features(scope, sections.entries(scope) if sections is not None else [])
+        features.update(known)
+    return {name: features[name] for name in FEATURE_NAMES}
@@ -1,47 +1,24 @@
-import PyPDF2
-import docx
 import re
-from io import BytesIO
+
+from .extraction import extract_document
 
 class ResumeParser:
     def __init__(self):
         pass
         
     def extract_text_from_pdf(self, pdf_file):
-        try:
-            # Handle different file input types
-            if hasattr(pdf_file, 'read'):
-                # If it's a file-like object
-                file_content = pdf_file.read()
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = pdf_file
-                
-            pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                else:
-                    # Handle empty page text
-                    text += "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error extracting text from PDF: {e}")
+        result = extract_document(pdf_file, kind='pdf')
+        if result.error:
+            print(f"Error extracting text from PDF: {result.error}")
             return ""
+        return result.text
             
     def extract_text_from_docx(self, docx_file):
-        try:
-            doc = docx.Document(BytesIO(docx_file.read()))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error extracting text from DOCX: {e}")
+        result = extract_document(docx_file, kind='docx')
+        if result.error:
+            print(f"Error extracting text from DOCX: {result.error}")
             return ""
+        return result.text
             
     def extract_text(self, file):
         # Reset file pointer to beginning
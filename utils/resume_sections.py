@@ -0,0 +1,166 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from .extraction import as_document
+from .keyword_matcher import KeywordMatcher
+
+# Header keywords for each section the standard analyzer extracts
+SECTION_KEYWORDS = {
+    'education': [
+        'education', 'academic', 'qualification', 'degree', 'university', 'college',
+        'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
+        'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc', 'bca', 'mca', 'b.com',
+        'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
+    ],
+    'experience': [
+        'experience', 'employment', 'work history', 'professional experience',
+        'work experience', 'career history', 'professional background',
+        'employment history', 'job history', 'positions held',
+        'job title', 'job responsibilities', 'job description', 'job summary'
+    ],
+    'projects': [
+        'projects', 'personal projects', 'academic projects', 'key projects',
+        'major projects', 'professional projects', 'project experience',
+        'relevant projects', 'featured projects', 'latest projects',
+        'top projects'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'competencies', 'expertise',
+        'core competencies', 'professional skills', 'key skills',
+        'technical expertise', 'proficiencies', 'qualifications',
+        'top skills', 'key skill', 'major skill', 'personal skill',
+        'soft skills', 'soft skill', 'soft skillset'
+    ],
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'objective',
+        'career objective', 'professional objective', 'about me', 'profile',
+        'professional profile', 'career profile', 'overview', 'skill summary'
+    ]
+}
+
+# Tag for the generic resume keywords that end any open section
+BOUNDARY = '_boundary'
+
+
+class SectionMap:
+    """Entries of every section, as lists of line indices into a ResumeDocument"""
+
+    def __init__(self, document, sections):
+        self.document = document
+        self.sections = sections
+        self._entries = {}
+
+    def entries(self, section):
+        """Return the entries of a section, each joined into one string"""
+        entries = self._entries.get(section)
+        if entries is None:
+            lines = self.document.lines
+            entries = [' '.join(lines[i].text for i in entry) for entry in self.sections.get(section, [])]
+            self._entries[section] = entries
+        return list(entries)
+
+    def digest(self, section):
+        """Content hash of a section's entries; equal digests mean equal entries"""
+        payload = json.dumps(self.entries(section), ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def __contains__(self, section):
+        return bool(self.sections.get(section))
+
+
+class _SectionState:
+    __slots__ = ('active', 'current', 'entries')
+
+    def __init__(self):
+        self.active = False
+        self.current = []
+        self.entries = []
+
+    def flush(self):
+        if self.current:
+            self.entries.append(self.current)
+            self.current = []
+
+
+class SectionSegmenter:
+    """Split a resume into sections with a single pass over its lines.
+
+    Every header keyword of every section, plus the generic resume keywords
+    that mark the start of some other section, goes into one KeywordMatcher,
+    so each line is classified exactly once. The per-section state machines
+    then advance together on that classification:
+
+    - a line containing one of a section's keywords opens (or continues)
+      that section, and is kept as content unless it is exactly a keyword;
+    - inside a section, a line with a generic resume keyword closes it;
+    - blank lines end the current entry.
+    """
+
+    def __init__(self, boundary_keywords, section_keywords=None):
+        section_keywords = section_keywords or SECTION_KEYWORDS
+        self.section_names = list(section_keywords)
+        tags = {}
+        for section, keywords in section_keywords.items():
+            for keyword in keywords:
+                tags.setdefault(keyword.lower(), set()).add(section)
+        for keyword in boundary_keywords:
+            tags.setdefault(keyword.lower(), set()).add(BOUNDARY)
+        self.tags = {keyword: frozenset(sections) for keyword, sections in tags.items()}
+        # Lines that are exactly a section keyword are bare headers, not content
+        self.headers = {
+            keyword: frozenset(s for s in sections if s != BOUNDARY)
+            for keyword, sections in self.tags.items()
+        }
+        self.matcher = KeywordMatcher(self.tags)
+        self.closure_tags = {
+            keyword: frozenset().union(*(self.tags[other] for other in contained))
+            for keyword, contained in self.matcher.closure.items()
+        }
+
+    def classify(self, document):
+        """Return {line index: sections (and BOUNDARY) whose keywords occur in the line}.
+
+        The matcher runs once over the whole lowercase text, reusing the hits
+        of lines it has seen before; keywords never span a newline, so each
+        hit belongs to the line it starts in.
+        """
+        hits = {}
+        for offset, keyword in self.matcher.scan(document.lower):
+            index = document.line_at(offset).index
+            hits[index] = hits.get(index, frozenset()) | self.closure_tags[keyword]
+        return hits
+
+    def segment(self, text):
+        document = as_document(text)
+        states = {section: _SectionState() for section in self.section_names}
+        line_hits = self.classify(document)
+
+        for line in document.lines:
+            hits = line_hits.get(line.index, ())
+            bare_header = self.headers.get(line.lower, ())
+            for section, state in states.items():
+                if section in hits:
+                    if section not in bare_header:
+                        # This line contains section content, not just a header
+                        state.current.append(line.index)
+                    state.active = True
+                elif state.active:
+                    if BOUNDARY in hits:
+                        # Hit another section
+                        state.active = False
+                        state.flush()
+                    elif line.text:
+                        state.current.append(line.index)
+                    else:
+                        state.flush()
+
+        for state in states.values():
+            state.flush()
+        return SectionMap(document, {section: state.entries for section, state in states.items()})
+
+
+@lru_cache(maxsize=8)
+def get_segmenter(boundary_keywords):
+    """Return a compiled segmenter for a tuple of boundary keywords"""
+    return SectionSegmenter(boundary_keywords)
@@ -0,0 +1,92 @@
+import heapq
+
+from .keyword_matcher import KeywordMatcher
+from .skill_matcher import iter_roles, lower_text
+
+# How much each kind of skill entry counts towards a role's fit
+REQUIRED_WEIGHT = 1.0
+TECHNICAL_WEIGHT = 0.5
+SOFT_WEIGHT = 0.25
+
+
+def _alternatives(entry):
+    """Terms that satisfy a skill entry: the entry itself and, for "A/B/C", each part"""
+    terms = {entry.lower()}
+    if '/' in entry:
+        terms.update(part.strip().lower() for part in entry.split('/') if part.strip())
+    return terms
+
+
+class RoleRecommender:
+    """Score every job role against a resume in one pass over the text.
+
+    An inverted index maps each skill term to the (role, entry) pairs it
+    satisfies. Every required skill of a role is one entry weighted
+    REQUIRED_WEIGHT, and every recommended technical or soft skill is one
+    entry weighted TECHNICAL_WEIGHT or SOFT_WEIGHT. A single word-boundary
+    scan finds the terms present in the resume; walking their postings
+    marks the satisfied entries, and a role's score is the satisfied share
+    of its total weight.
+    """
+
+    def __init__(self, roles=None):
+        roles = list(roles) if roles is not None else list(iter_roles())
+        self.categories = {}
+        self.entries = {}        # role -> [(skill, weight)]
+        self.total_weight = {}   # role -> sum of entry weights
+        self.index = {}          # term -> [(role, entry number)]
+
+        for category, role, info in roles:
+            self.categories[role] = category
+            entries = [(skill, REQUIRED_WEIGHT) for skill in info.get('required_skills', [])]
+            recommended = info.get('recommended_skills', {})
+            entries += [(skill, TECHNICAL_WEIGHT) for skill in recommended.get('technical', [])]
+            entries += [(skill, SOFT_WEIGHT) for skill in recommended.get('soft', [])]
+            self.entries[role] = entries
+            self.total_weight[role] = sum(weight for _, weight in entries)
+            for number, (skill, _) in enumerate(entries):
+                for term in _alternatives(skill):
+                    self.index.setdefault(term, []).append((role, number))
+
+        self.matcher = KeywordMatcher(self.index, word_boundary=True)
+
+    def score_roles(self, text):
+        """Return {role: (score 0-100, matched skills)} for every role"""
+        satisfied = {}
+        for term in self.matcher.find(lower_text(text)):
+            for role, number in self.index[term]:
+                satisfied.setdefault(role, set()).add(number)
+
+        scores = {}
+        for role, entries in self.entries.items():
+            numbers = sorted(satisfied.get(role, ()))
+            weight = sum(entries[number][1] for number in numbers)
+            score = weight / self.total_weight[role] * 100 if self.total_weight[role] else 0
+            # A skill can be both required and recommended; list it once
+            matched = list(dict.fromkeys(entries[number][0] for number in numbers))
+            scores[role] = (score, matched)
+        return scores
+
+    def recommend(self, text, top_k=3):
+        """Return the top_k best fitting roles, best first"""
+        scores = self.score_roles(text)
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1][0])
+        return [
+            {
+                'role': role,
+                'category': self.categories[role],
+                'score': round(score, 1),
+                'matched_skills': matched
+            }
+            for role, (score, matched) in best
+            if score > 0
+        ]
+
+
+# Built at import so recommending roles adds no setup cost to an analysis
+_recommender = RoleRecommender()
+
+
+def get_role_recommender():
+    """Return the recommender built from JOB_ROLES"""
+    return _recommender
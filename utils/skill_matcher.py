@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+import numpy as np
+
+from config.job_roles import JOB_ROLES
+
+from .extraction import ResumeDocument
+from .keyword_matcher import KeywordMatcher
+
+
+@lru_cache(maxsize=128)
+def _compile(skills):
+    return KeywordMatcher(skills, word_boundary=True)
+
+
+def skill_matcher(skills):
+    """Return the compiled word-boundary matcher for a list of skills, cached by content"""
+    return _compile(tuple(skills))
+
+
+def iter_roles():
+    """Yield (category, role name, role info) for every role in JOB_ROLES"""
+    for category, roles in JOB_ROLES.items():
+        for role, info in roles.items():
+            yield category, role, info
+
+
+def match_skills(text, skills):
+    """Match skills against lowercase text in a single scan.
+
+    Returns {skill: sorted character offsets} for every skill found, using
+    the spelling given in `skills`.
+    """
+    positions = skill_matcher(skills).positions(text)
+    return {skill: positions[skill.lower()] for skill in skills if skill.lower() in positions}
+
+
+# Compile every role's matcher at import so the first analysis does not pay for it
+ROLE_SKILL_MATCHERS = {role: skill_matcher(info['required_skills']) for _, role, info in iter_roles()}
+
+# Union of the required skills of every role; the columns of the presence matrix
+REQUIRED_SKILLS = sorted({skill.lower() for _, _, info in iter_roles() for skill in info['required_skills']})
+SKILL_INDEX = {skill: column for column, skill in enumerate(REQUIRED_SKILLS)}
+REQUIRED_SKILLS_MATCHER = skill_matcher(REQUIRED_SKILLS)
+ROLE_CATEGORIES = {role: category for category, role, _ in iter_roles()}
+
+
+def lower_text(text):
+    return text.lower if isinstance(text, ResumeDocument) else (text or '').lower()
+
+
+def skill_presence_matrix(texts):
+    """Return a (resumes x REQUIRED_SKILLS) boolean matrix, scanning each text once"""
+    presence = np.zeros((len(texts), len(REQUIRED_SKILLS)), dtype=bool)
+    for row, text in enumerate(texts):
+        columns = [SKILL_INDEX[skill] for skill in REQUIRED_SKILLS_MATCHER.find(lower_text(text))]
+        presence[row, columns] = True
+    return presence
+
+
+def role_weight_matrix(roles):
+    """Return a (REQUIRED_SKILLS x roles) matrix whose column sums are 1.
+
+    Each required skill of a role weighs 1 / len(required_skills), so a
+    presence row times this matrix is the fraction of required skills found,
+    exactly as calculate_keyword_match counts it.
+    """
+    weights = np.zeros((len(REQUIRED_SKILLS), len(roles)), dtype=np.float64)
+    for column, role in enumerate(roles):
+        if role not in ROLE_CATEGORIES:
+            raise ValueError(f"Unknown job role: {role}")
+        required = JOB_ROLES[ROLE_CATEGORIES[role]][role]['required_skills']
+        for skill in required:
+            weights[SKILL_INDEX[skill.lower()], column] += 1 / len(required)
+    return weights
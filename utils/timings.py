@@ -0,0 +1,124 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in nanoseconds: 1 µs to ~2 min, each 25% wider than the last
+BUCKET_GROWTH = 1.25
+BUCKET_BOUNDS = []
+_bound = 1000.0
+while _bound < 120e9:
+    BUCKET_BOUNDS.append(int(_bound))
+    _bound *= BUCKET_GROWTH
+del _bound
+
+
+class Histogram:
+    """Fixed-memory latency histogram with log-spaced buckets.
+
+    Percentiles are reported as the upper bound of the bucket they fall in,
+    so they are accurate to within one bucket (25%).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+
+    def percentile(self, fraction):
+        """Return the duration (ns) below which `fraction` of the samples fall"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max_ns)
+        return self.max_ns
+
+
+class TimingRegistry:
+    """Process-wide histograms of stage durations, keyed by "<pipeline>.<stage>" """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, duration_ns):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(duration_ns)
+
+    def snapshot(self):
+        """Return one dict per stage with its count and p50/p95/p99/mean/max in milliseconds"""
+        with self._lock:
+            rows = []
+            for name, histogram in sorted(self._histograms.items()):
+                rows.append({
+                    'stage': name,
+                    'count': histogram.count,
+                    'p50_ms': histogram.percentile(0.50) / 1e6,
+                    'p95_ms': histogram.percentile(0.95) / 1e6,
+                    'p99_ms': histogram.percentile(0.99) / 1e6,
+                    'mean_ms': histogram.total_ns / histogram.count / 1e6,
+                    'max_ms': histogram.max_ns / 1e6
+                })
+            return rows
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_registry = TimingRegistry()
+
+
+def get_timing_registry():
+    """Return the process-wide timing registry"""
+    return _registry
+
+
+class StageTimer:
+    """Times the stages of one run with perf_counter_ns.
+
+    Durations are kept per run in `timings` (milliseconds, for the result
+    dict) and recorded into the process-wide registry as "<pipeline>.<stage>".
+    A stage that runs more than once in a run accumulates.
+    """
+
+    def __init__(self, pipeline, registry=None):
+        self.pipeline = pipeline
+        self.registry = registry or _registry
+        self.timings = {}
+        self.started_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter_ns() - start)
+
+    def mark(self, name):
+        """Record the time from the start of the run until now, e.g. time to first output"""
+        self.add(name, time.perf_counter_ns() - self.started_ns)
+
+    def add(self, name, duration_ns):
+        self.timings[name] = self.timings.get(name, 0) + duration_ns / 1e6
+        self.registry.record(f"{self.pipeline}.{name}", duration_ns)
+
+    def finish(self):
+        """Record the total duration of the run and return the per-stage timings"""
+        self.add('total', time.perf_counter_ns() - self.started_ns)
+        return self.timings